@@ -2,43 +2,87 @@
 
 from __future__ import annotations
 
-from hyponcloud import AuthenticationError, HyponCloud
+import asyncio
+
+from hyponcloud import AuthenticationError
 
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .coordinator import HypontechConfigEntry, HypontechDataCoordinator
+from .const import DOMAIN, STARTUP_TIME_BUDGET
+from .coordinator import (
+    HypontechConfigEntry,
+    HypontechDataCoordinator,
+    async_remove_snapshot,
+)
+from .services import async_setup_services
+from .session import async_get_session_registry
+from .throttle import async_get_throttle
 
 _PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Hypontech Cloud services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: HypontechConfigEntry) -> bool:
     """Set up Hypontech Cloud from a config entry."""
-    session = async_get_clientsession(hass)
-    hypontech_cloud = HyponCloud(
-        entry.data[CONF_USERNAME],
-        entry.data[CONF_PASSWORD],
-        session,
+    hypontech_cloud = await async_get_session_registry(hass).async_get_client(
+        entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
     )
-    try:
-        await hypontech_cloud.connect()
-    except AuthenticationError as ex:
-        raise ConfigEntryAuthFailed("Authentication failed for Hypontech Cloud") from ex
-    except (TimeoutError, ConnectionError) as ex:
-        raise ConfigEntryNotReady("Cannot connect to Hypontech Cloud") from ex
-
+    throttle = async_get_throttle(hass)
+    entry.async_on_unload(throttle.async_register(entry.entry_id))
     coordinator = HypontechDataCoordinator(hass, entry, hypontech_cloud)
-    await coordinator.async_config_entry_first_refresh()
+
+    if await coordinator.async_restore_snapshot():
+        # Start from the last known data and let the cloud catch up in the
+        # background instead of holding up startup.
+        refresh = entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "hypontech startup refresh"
+        )
+        await asyncio.wait((refresh,), timeout=STARTUP_TIME_BUDGET)
+    else:
+        try:
+            await throttle.async_wait_login(hypontech_cloud)
+            async with throttle.async_request():
+                await hypontech_cloud.connect()
+        except AuthenticationError as ex:
+            raise ConfigEntryAuthFailed(
+                "Authentication failed for Hypontech Cloud"
+            ) from ex
+        except (TimeoutError, ConnectionError) as ex:
+            raise ConfigEntryNotReady("Cannot connect to Hypontech Cloud") from ex
+        await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: HypontechConfigEntry
+) -> None:
+    """Apply changed plant options without a reload."""
+    await entry.runtime_data.async_options_updated()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: HypontechConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: HypontechConfigEntry) -> None:
+    """Forget the saved session and data of a removed config entry."""
+    await async_get_session_registry(hass).async_forget(entry.data[CONF_USERNAME])
+    await async_remove_snapshot(hass, entry.entry_id)
@@ -0,0 +1,92 @@
+"""Hypon Cloud requests the client library does not offer."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import re
+
+from aiohttp import ClientError, ClientSession, hdrs
+from hyponcloud import HyponCloud, PlantData, RateLimitError, RequestError
+
+from homeassistant.util.json import json_loads
+
+from .const import PLANT_PAGE_SIZE
+from .session import get_token
+
+# The library reports a rejected token like any other failed request, with
+# the status only at the end of the message.
+_LIBRARY_UNAUTHORIZED = re.compile(r"\bHTTP 401$")
+
+
+class TokenRejectedError(RequestError):
+    """Exception raised when the cloud rejects the token of a request."""
+
+
+def token_rejected(err: BaseException) -> bool:
+    """Return if a request failed because the cloud rejected the token."""
+    if isinstance(err, TokenRejectedError):
+        return True
+    return (
+        isinstance(err, RequestError)
+        and _LIBRARY_UNAUTHORIZED.search(str(err)) is not None
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class PlantPage:
+    """One page of the plant list, without plants when it did not change."""
+
+    plants: list[PlantData] | None
+    page_count: int = 1
+    # The ETag of the page, or a hash of its body if the cloud sends none.
+    fingerprint: str | None = None
+
+
+async def async_get_plant_page(
+    client: HyponCloud,
+    session: ClientSession,
+    page: int,
+    fingerprint: str | None = None,
+) -> PlantPage:
+    """Return one page of the plant list of an account.
+
+    The library only ever requests the first ten plants. The client must
+    have logged in already. When the page still has the fingerprint it had
+    before, it is not parsed again and returned without plants.
+    """
+    token, _ = get_token(client)
+    headers = {hdrs.AUTHORIZATION: f"Bearer {token}"}
+    if fingerprint is not None:
+        headers[hdrs.IF_NONE_MATCH] = fingerprint
+    try:
+        async with session.get(
+            f"{client.base_url}/plant/list2",
+            params={"page": page, "page_size": PLANT_PAGE_SIZE, "refresh": "true"},
+            headers=headers,
+        ) as response:
+            if response.status == 304:
+                return PlantPage(plants=None, fingerprint=fingerprint)
+            if response.status == 401:
+                raise TokenRejectedError(
+                    f"Failed to get plant list page {page}: HTTP 401"
+                )
+            if response.status == 429:
+                raise RateLimitError("Rate limit exceeded for plant list endpoint")
+            if response.status != 200:
+                raise RequestError(
+                    f"Failed to get plant list page {page}: HTTP {response.status}"
+                )
+            body = await response.read()
+            etag = response.headers.get(hdrs.ETAG)
+        new_fingerprint = etag or hashlib.blake2b(body, digest_size=16).hexdigest()
+        if new_fingerprint == fingerprint:
+            return PlantPage(plants=None, fingerprint=fingerprint)
+        result = json_loads(body)
+        return PlantPage(
+            plants=[PlantData.from_dict(item) for item in result["data"]],
+            page_count=result.get("totalPage", 1),
+            fingerprint=new_fingerprint,
+        )
+    except (ClientError, KeyError, TypeError, ValueError) as err:
+        raise RequestError(f"Failed to get plant list page {page}: {err}") from err
@@ -4,16 +4,57 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 import logging
+from operator import itemgetter
 from typing import Any
+from uuid import uuid4
 
 from hyponcloud import AuthenticationError, HyponCloud
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigEntryState,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_NAME, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import DOMAIN
+from .const import (
+    CONF_CONDITION,
+    CONF_DAYLIGHT_ONLY,
+    CONF_EXCLUDE_NAMES,
+    CONF_EXCLUDE_PLANTS,
+    CONF_HYSTERESIS,
+    CONF_INCLUDE_PLANTS,
+    CONF_MAX_INTERVAL,
+    CONF_METRIC,
+    CONF_MIN_INTERVAL,
+    CONF_REFRESH_SPACING,
+    CONF_RULE_ID,
+    CONF_RULES,
+    CONF_TARGET,
+    CONF_THRESHOLD,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_REFRESH_SPACING,
+    DOMAIN,
+)
+from .rules import RuleCondition, RuleMetric, RuleTarget
+from .session import async_get_session_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,10 +65,64 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_MIN_INTERVAL, default=DEFAULT_MIN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=30, max=3600)
+        ),
+        vol.Required(CONF_MAX_INTERVAL, default=DEFAULT_MAX_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=30, max=3600)
+        ),
+        vol.Required(CONF_REFRESH_SPACING, default=DEFAULT_REFRESH_SPACING): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=300)
+        ),
+    }
+)
+
+RULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): TextSelector(),
+        vol.Required(CONF_TARGET, default=RuleTarget.OVERVIEW): SelectSelector(
+            SelectSelectorConfig(
+                options=list(RuleTarget),
+                mode=SelectSelectorMode.DROPDOWN,
+                translation_key=CONF_TARGET,
+            )
+        ),
+        vol.Required(CONF_METRIC, default=RuleMetric.POWER): SelectSelector(
+            SelectSelectorConfig(
+                options=list(RuleMetric),
+                mode=SelectSelectorMode.DROPDOWN,
+                translation_key=CONF_METRIC,
+            )
+        ),
+        vol.Required(CONF_CONDITION, default=RuleCondition.BELOW): SelectSelector(
+            SelectSelectorConfig(
+                options=list(RuleCondition),
+                mode=SelectSelectorMode.DROPDOWN,
+                translation_key=CONF_CONDITION,
+            )
+        ),
+        vol.Required(CONF_THRESHOLD): NumberSelector(
+            NumberSelectorConfig(mode=NumberSelectorMode.BOX, step="any")
+        ),
+        vol.Required(CONF_HYSTERESIS, default=0): NumberSelector(
+            NumberSelectorConfig(min=0, mode=NumberSelectorMode.BOX, step="any")
+        ),
+        vol.Required(CONF_DAYLIGHT_ONLY, default=False): BooleanSelector(),
+    }
+)
+
 
 class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Hypontech Cloud."""
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> HypontechOptionsFlow:
+        """Get the options flow for this handler."""
+        return HypontechOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -35,7 +130,7 @@ class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
-                session = async_get_clientsession(self.hass)
+                session = async_get_session_registry(self.hass).http_session
                 hypon = HyponCloud(
                     user_input[CONF_USERNAME], user_input[CONF_PASSWORD], session
                 )
@@ -52,6 +147,9 @@ class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
                 await self.async_set_unique_id(admin_info.id)
                 self._abort_if_unique_id_configured()
 
+                async_get_session_registry(self.hass).async_register(
+                    user_input[CONF_USERNAME], user_input[CONF_PASSWORD], hypon
+                )
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME],
                     data=user_input,
@@ -74,7 +172,7 @@ class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
-                session = async_get_clientsession(self.hass)
+                session = async_get_session_registry(self.hass).http_session
                 hypon = HyponCloud(
                     user_input[CONF_USERNAME], user_input[CONF_PASSWORD], session
                 )
@@ -91,6 +189,9 @@ class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
                 # Verify account ID matches existing entry
                 await self.async_set_unique_id(admin_info.id)
                 self._abort_if_unique_id_mismatch(reason="wrong_account")
+                async_get_session_registry(self.hass).async_register(
+                    user_input[CONF_USERNAME], user_input[CONF_PASSWORD], hypon
+                )
                 return self.async_update_reload_and_abort(
                     self._get_reauth_entry(),
                     data_updates={
@@ -104,3 +205,130 @@ class HypontechConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class HypontechOptionsFlow(OptionsFlow):
+    """Handle Hypontech Cloud options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Choose the options to change."""
+        menu_options = ["intervals", "plants", "add_rule"]
+        if self.config_entry.options.get(CONF_RULES):
+            menu_options.append("remove_rules")
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    async def async_step_intervals(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling intervals."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "min_above_max"
+            else:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, **user_input}
+                )
+
+        return self.async_show_form(
+            step_id="intervals",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
+
+    async def async_step_plants(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Select the plants that get entities."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self.config_entry.options, **user_input}
+            )
+
+        # Plants already filtered out are only known by their ID.
+        names: dict[str, str] = {
+            plant_id: plant_id
+            for key in (CONF_INCLUDE_PLANTS, CONF_EXCLUDE_PLANTS)
+            for plant_id in self.config_entry.options.get(key, [])
+        }
+        if self.config_entry.state is ConfigEntryState.LOADED:
+            plants = self.config_entry.runtime_data.data.plants
+            names.update(
+                (plant_id, plants.names[slot] or plant_id)
+                for plant_id, slot in plants.index.items()
+            )
+        plant_selector = SelectSelector(
+            SelectSelectorConfig(
+                options=[
+                    SelectOptionDict(value=plant_id, label=name)
+                    for plant_id, name in sorted(names.items(), key=itemgetter(1))
+                ],
+                multiple=True,
+                custom_value=True,
+            )
+        )
+        schema = vol.Schema(
+            {
+                vol.Optional(CONF_INCLUDE_PLANTS, default=[]): plant_selector,
+                vol.Optional(CONF_EXCLUDE_PLANTS, default=[]): plant_selector,
+                vol.Optional(CONF_EXCLUDE_NAMES, default=[]): TextSelector(
+                    TextSelectorConfig(multiple=True)
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="plants",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, self.config_entry.options
+            ),
+        )
+
+    async def async_step_add_rule(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add a threshold rule firing events."""
+        if user_input is not None:
+            rule = {CONF_RULE_ID: uuid4().hex, **user_input}
+            rules = [*self.config_entry.options.get(CONF_RULES, []), rule]
+            return self.async_create_entry(
+                data={**self.config_entry.options, CONF_RULES: rules}
+            )
+
+        return self.async_show_form(step_id="add_rule", data_schema=RULE_SCHEMA)
+
+    async def async_step_remove_rules(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Remove threshold rules."""
+        rules: list[dict[str, Any]] = self.config_entry.options.get(CONF_RULES, [])
+        if user_input is not None:
+            removed = set(user_input[CONF_RULES])
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    CONF_RULES: [
+                        rule for rule in rules if rule[CONF_RULE_ID] not in removed
+                    ],
+                }
+            )
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_RULES, default=[]): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[
+                            SelectOptionDict(
+                                value=rule[CONF_RULE_ID], label=rule[CONF_NAME]
+                            )
+                            for rule in rules
+                        ],
+                        multiple=True,
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(step_id="remove_rules", data_schema=schema)
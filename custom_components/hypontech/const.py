@@ -5,3 +5,83 @@ from logging import Logger, getLogger
 DOMAIN = "hypontech"
 
 LOGGER: Logger = getLogger(__package__)
+
+# Upper bound for a single cloud call, including the client library's own
+# internal retries.
+REQUEST_TIMEOUT = 30
+
+# Upper bound for a whole update. A call still running then is given up
+# and its part of the data is kept at its last values. A plant list too
+# long to fetch in time goes on from the page it reached with the next one.
+UPDATE_DEADLINE = 60
+
+# How long setup waits for fresh data when it can start from a snapshot.
+STARTUP_TIME_BUDGET = 10
+
+# Cloud calls of all accounts together running at the same time.
+MAX_CONCURRENT_REQUESTS = 4
+
+# Seconds between two logins while Home Assistant starts, so accounts set
+# up together do not log in all at once.
+LOGIN_SPACING = 1
+
+ATTR_STALE = "stale"
+ATTR_FETCHED_AT = "fetched_at"
+
+# Successful updates a plant must be missing from the account before its
+# device is removed.
+PLANT_REMOVAL_GRACE = 3
+
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 900
+
+# Shortest time between two updates requested through the refresh service.
+CONF_REFRESH_SPACING = "refresh_spacing"
+DEFAULT_REFRESH_SPACING = 10
+
+SERVICE_REFRESH = "refresh"
+
+# The plant list carries membership, names and per plant figures that
+# change slowly, so it is fetched less often than the overview. The fleet
+# sensors follow it at this pace too. Only while a plant power sensor is
+# enabled, or a rule watches the power of plants, is the list fetched on
+# every update.
+PLANT_LIST_INTERVAL = 300
+
+# Seconds between two fetches of the overview or the plant list while no
+# entity uses it, so the plant devices still follow the account.
+UNUSED_PART_INTERVAL = 3600
+
+# Plants requested per page of the plant list.
+PLANT_PAGE_SIZE = 100
+
+CONF_INCLUDE_PLANTS = "include_plants"
+CONF_EXCLUDE_PLANTS = "exclude_plants"
+CONF_EXCLUDE_NAMES = "exclude_names"
+
+# Threshold rules, stored in the options as a list of dictionaries.
+CONF_RULES = "rules"
+CONF_RULE_ID = "rule_id"
+CONF_TARGET = "target"
+CONF_METRIC = "metric"
+CONF_CONDITION = "condition"
+CONF_THRESHOLD = "threshold"
+CONF_HYSTERESIS = "hysteresis"
+CONF_DAYLIGHT_ONLY = "daylight_only"
+
+EVENT_THRESHOLD_TRIGGERED = f"{DOMAIN}_threshold_triggered"
+EVENT_THRESHOLD_CLEARED = f"{DOMAIN}_threshold_cleared"
+
+# Jittered retries of a single call within one update.
+REQUEST_RETRIES = 2
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 10
+
+# Consecutive failed updates before the circuit breaker opens, and the
+# bounds of the time it stays open.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_BASE_DELAY = 60
+BREAKER_MAX_DELAY = 1800
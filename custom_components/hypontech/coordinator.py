@@ -2,16 +2,65 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import StrEnum
+from fnmatch import fnmatch
+from functools import partial
+from time import monotonic
+from typing import Any, NoReturn
 
-from hyponcloud import HyponCloud, OverviewData, PlantData, RequestError
+from hyponcloud import (
+    AuthenticationError,
+    HyponCloud,
+    OverviewData,
+    PlantData,
+    RateLimitError,
+    RequestError,
+)
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
+from .api import async_get_plant_page, token_rejected
+from .const import (
+    CONF_EXCLUDE_NAMES,
+    CONF_EXCLUDE_PLANTS,
+    CONF_INCLUDE_PLANTS,
+    CONF_METRIC,
+    CONF_REFRESH_SPACING,
+    CONF_RULES,
+    CONF_TARGET,
+    DEFAULT_REFRESH_SPACING,
+    DOMAIN,
+    LOGGER,
+    PLANT_LIST_INTERVAL,
+    PLANT_REMOVAL_GRACE,
+    REQUEST_RETRIES,
+    REQUEST_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    UNUSED_PART_INTERVAL,
+    UPDATE_DEADLINE,
+)
+from .fleet import FleetStats, compute_fleet_stats
+from .history import SampleRing
+from .metrics import HypontechMetrics
+from .plants import PlantColumns
+from .retry import HypontechCircuitBreaker, decorrelated_jitter
+from .rules import HypontechRuleEngine, RuleMetric, RuleTarget
+from .scheduler import HypontechPollingScheduler
+from .session import async_get_session_registry, get_token, needs_login
+from .throttle import async_get_throttle
 
 
 @dataclass
@@ -19,11 +68,73 @@ class HypontechCoordinatorData:
     """Store coordinator data."""
 
     overview: OverviewData
-    plants: dict[str, PlantData]
+    plants: PlantColumns
+    fleet: FleetStats = field(default_factory=FleetStats)
+    # Restored from disk and not confirmed by the cloud yet.
+    stale: bool = False
+    # While the overview or the plant list cannot be fetched, their last
+    # values are kept and these tell when those were fetched.
+    overview_fetched_at: datetime | None = None
+    plants_fetched_at: datetime | None = None
 
 
 type HypontechConfigEntry = ConfigEntry[HypontechDataCoordinator]
 
+# Listener context notified when plants join or leave the account.
+PLANT_LIST_CONTEXT = "plant_list"
+# Listener context of the fleet aggregates.
+FLEET_CONTEXT = "fleet"
+
+
+class DataPart(StrEnum):
+    """A part of the data, fetched with a cloud call of its own."""
+
+    OVERVIEW = "overview"
+    PLANTS = "plants"
+
+
+@dataclass(slots=True)
+class _PlantPageRecord:
+    """What a page of the plant list held when it was last parsed."""
+
+    fingerprint: str | None
+    page_count: int
+    plant_ids: list[str]
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last known data of a config entry."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the last known data of a config entry."""
+    await _snapshot_store(hass, entry_id).async_remove()
+
+
+def plant_included(options: Mapping[str, Any], plant_id: str, name: str) -> bool:
+    """Return if the plant options select a plant."""
+    if (include := options.get(CONF_INCLUDE_PLANTS)) and plant_id not in include:
+        return False
+    if plant_id in options.get(CONF_EXCLUDE_PLANTS, ()):
+        return False
+    return not any(
+        fnmatch(name.casefold(), pattern.casefold())
+        for pattern in options.get(CONF_EXCLUDE_NAMES, ())
+    )
+
+
+def _plant_filter(options: Mapping[str, Any]) -> tuple[tuple[str, ...], ...]:
+    """Return the plant options selecting plants, to tell when they change."""
+    return tuple(
+        tuple(options.get(key, ()))
+        for key in (CONF_INCLUDE_PLANTS, CONF_EXCLUDE_PLANTS, CONF_EXCLUDE_NAMES)
+    )
+
 
 class HypontechDataCoordinator(DataUpdateCoordinator[HypontechCoordinatorData]):
     """Coordinator used for all sensors."""
@@ -37,24 +148,609 @@ class HypontechDataCoordinator(DataUpdateCoordinator[HypontechCoordinatorData]):
         api: HyponCloud,
     ) -> None:
         """Initialize my coordinator."""
+        self.scheduler = HypontechPollingScheduler(hass, config_entry)
+        self.breaker = HypontechCircuitBreaker()
         super().__init__(
             hass,
             LOGGER,
             config_entry=config_entry,
             name="Hypontech Data",
-            update_interval=timedelta(seconds=60),
+            update_interval=self.scheduler.min_interval,
         )
         self.api = api
+        self.sessions = async_get_session_registry(hass)
+        self.throttle = async_get_throttle(hass)
+        self._login_lock = asyncio.Lock()
+        # Seconds the last update waited for calls of other accounts, and
+        # when the next one is due.
+        self.throttle_wait = 0.0
+        self.next_update: datetime | None = None
+        self.fetch_durations: dict[str, float] = {}
+        self.metrics = HypontechMetrics()
+        self._diagnostics_listeners: list[CALLBACK_TYPE] = []
+        self.suppressed_updates = 0
+        self.skipped_updates = 0
+        self._plant_pages: dict[int, _PlantPageRecord] = {}
+        # Where the pass over the plant list goes on, and the plants it saw.
+        self._next_plant_page = 1
+        self._seen_plant_ids: set[str] = set()
+        self._plant_filter = _plant_filter(config_entry.options)
+        self._snapshot = _snapshot_store(hass, config_entry.entry_id)
+        self._dispatched_data: HypontechCoordinatorData | None = None
+        # The plants are merged in place, so the listener contexts to update
+        # are collected along the way instead of comparing whole updates.
+        self.plants = PlantColumns()
+        self._changed_contexts: set[str | None] = set()
+        # Plants that have entities, maintained by the sensor platform.
+        self.plant_ids: set[str] = set()
+        self._checked_plant_ids: set[str] | None = None
+        self._missing_plants: dict[str, int] = {}
+        self._plants_due: datetime | None = None
+        self.rules = HypontechRuleEngine(hass, config_entry.entry_id)
+        self.overview_history = SampleRing()
+        # When the cloud last answered, and the update running, if any.
+        self.last_fetched: datetime | None = None
+        self._last_attempt: datetime | None = None
+        self._updating: asyncio.Future[None] | None = None
+        self._overview_fetched_at: datetime | None = None
+        self._plants_fetched_at: datetime | None = None
+        # Entities using each part of the data, and the parts left out of
+        # the last update for want of them.
+        self._consumers: Counter[DataPart] = Counter()
+        # Entities showing the power of plants, which keep the plant list on
+        # every update.
+        self._live_plant_consumers = 0
+        self.unused_parts: set[DataPart] = set()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the data saved by the last successful update, flagged stale."""
+        if (snapshot := await self._snapshot.async_load()) is None:
+            return False
+        options = self.config_entry.options
+        for plant in snapshot["plants"]:
+            if plant_included(options, plant["plant_id"], plant["plant_name"]):
+                self.plants.update(
+                    PlantData.from_dict(plant), plant.get("peak_power", 0)
+                )
+        self.data = HypontechCoordinatorData(
+            overview=OverviewData.from_dict(snapshot["overview"]),
+            plants=self.plants,
+            fleet=compute_fleet_stats(self.plants),
+            stale=True,
+        )
+        return True
+
+    @callback
+    def _async_snapshot_data(self) -> dict[str, Any]:
+        """Return the current data in its on-disk form."""
+        return {
+            "overview": self.data.overview.to_dict(),
+            "plants": self.data.plants.as_dicts(),
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose data changed since the last dispatch.
+
+        Plant entities listen with their plant ID as context, overview
+        entities without context. An update that changed nothing notifies
+        nobody.
+        """
+        changed, self._changed_contexts = self._changed_contexts, set()
+        previous = self._dispatched_data
+        self._dispatched_data = self.data if self.last_update_success else None
+        if (
+            previous is None
+            or self._dispatched_data is None
+            or previous.stale != self._dispatched_data.stale
+        ):
+            # First data, or availability changed: everyone needs to know.
+            super().async_update_listeners()
+            return
+        if previous is self._dispatched_data:
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context in changed:
+                update_callback()
+            else:
+                self.suppressed_updates += 1
+
+    async def _async_login(self) -> None:
+        """Log in unless the client has a valid token, one login at a time."""
+        async with self._login_lock:
+            if needs_login(self.api):
+                await self._async_timed_fetch("connect", self.api.connect)
+
+    async def _async_timed_fetch[T](
+        self, name: str, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Run a single cloud call with a timeout and jittered retries.
+
+        Every attempt is recorded in the metrics. Rate limits are not
+        retried, hammering the cloud would only extend them. A token the
+        cloud rejects, e.g. one restored from disk or one it expired early,
+        is dropped and the call is retried right away after logging in,
+        once.
+        """
+        delay = float(RETRY_BASE_DELAY)
+        attempt = 0
+        logged_in_again = False
+        while True:
+            token = get_token(self.api)[0]
+            rejected = False
+            async with self.throttle.async_request() as waited:
+                self.throttle_wait += waited
+                start = monotonic()
+                try:
+                    with self.metrics.measure(name):
+                        async with asyncio.timeout(REQUEST_TIMEOUT):
+                            result = await fetch()
+                except (AuthenticationError, RateLimitError):
+                    self._async_record_fetch(name, start, success=False)
+                    raise
+                except (RequestError, TimeoutError) as err:
+                    self._async_record_fetch(name, start, success=False)
+                    rejected = not logged_in_again and token_rejected(err)
+                    if not rejected and attempt == REQUEST_RETRIES:
+                        raise
+                else:
+                    self._async_record_fetch(name, start, success=True)
+                    return result
+            if rejected:
+                logged_in_again = True
+                self.sessions.async_token_rejected(
+                    self.config_entry.data[CONF_USERNAME], token
+                )
+                await self._async_login()
+                continue
+            attempt += 1
+            delay = decorrelated_jitter(delay, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+            LOGGER.debug("Retrying %s in %.1fs", name, delay)
+            await asyncio.sleep(delay)
+
+    @callback
+    def _async_record_fetch(self, name: str, start: float, success: bool) -> None:
+        """Record the duration and outcome of one attempt of a call."""
+        duration = monotonic() - start
+        self.fetch_durations[name] = duration
+        self.metrics.record(name, duration, success)
+
+    @callback
+    def _async_raise_update_error(self, ex: ExceptionGroup) -> NoReturn:
+        """Record a failed update and raise the matching error."""
+        if ex.subgroup(AuthenticationError) is not None:
+            raise ConfigEntryAuthFailed(
+                "Authentication failed for Hypontech Cloud"
+            ) from ex
+        self.sessions.async_token_failed(self.config_entry.data[CONF_USERNAME])
+        rate_limited = ex.subgroup(RateLimitError) is not None
+        self.breaker.async_record_failure(rate_limited=rate_limited)
+        self.update_interval = self._async_next_interval()
+        raise UpdateFailed(
+            translation_domain=DOMAIN,
+            translation_key="rate_limited" if rate_limited else "connection_error",
+        ) from ex
+
+    @callback
+    def _async_next_interval(self) -> timedelta:
+        """Return the delay until the next update."""
+        now = dt_util.utcnow()
+        interval = self.scheduler.async_next_interval(now)
+        if not self.scheduler.cadence.locked:
+            # Take turns with the other accounts, unless polls follow the
+            # cloud's own refreshes.
+            interval = self.throttle.async_stagger(
+                self.config_entry.entry_id, now, interval
+            )
+        interval = max(interval, self.breaker.async_retry_in())
+        self.next_update = now + interval
+        return interval
+
+    @callback
+    def _async_remove_missing_plants(self, plants: PlantColumns) -> None:
+        """Remove the devices of plants missing from the account for a while.
+
+        Plants deselected in the options are removed right away.
+        """
+        if not self._missing_plants and self._checked_plant_ids == plants.index.keys():
+            return
+        self._checked_plant_ids = set(plants)
+
+        device_registry = dr.async_get(self.hass)
+        entry_id = self.config_entry.entry_id
+        missing: dict[str, int] = {}
+        for device in dr.async_entries_for_config_entry(device_registry, entry_id):
+            for domain, plant_id in device.identifiers:
+                if domain != DOMAIN or plant_id == entry_id or plant_id in plants:
+                    continue
+                count = self._missing_plants.get(plant_id, 0) + 1
+                if count < PLANT_REMOVAL_GRACE and plant_included(
+                    self.config_entry.options, plant_id, device.name or ""
+                ):
+                    missing[plant_id] = count
+                    continue
+                LOGGER.info("Removing plant %s", plant_id)
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry_id
+                )
+                self.plant_ids.discard(plant_id)
+        self._missing_plants = missing
+
+    async def async_options_updated(self) -> None:
+        """Fetch the plant list again if other plants were selected."""
+        if (plant_filter := _plant_filter(self.config_entry.options)) == (
+            self._plant_filter
+        ):
+            return
+        self._plant_filter = plant_filter
+        await self.async_refresh_plants()
+
+    async def async_refresh_plants(self) -> None:
+        """Fetch the plant list with the next update."""
+        self._plants_due = None
+        self._plant_pages.clear()
+        self._next_plant_page = 1
+        self._seen_plant_ids.clear()
+        await self.async_request_refresh()
+
+    @callback
+    def async_add_diagnostics_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the end of every update, also failed or skipped ones."""
+        self._diagnostics_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._diagnostics_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_consumer(self, part: DataPart, live: bool = False) -> CALLBACK_TYPE:
+        """Register an entity using a part of the data.
+
+        A part that was left out for want of users is fetched again right
+        away. Live users of the plants, showing their power, have the plant
+        list fetched on every update instead of every PLANT_LIST_INTERVAL.
+        """
+        self._consumers[part] += 1
+        self._live_plant_consumers += live
+        if part in self.unused_parts:
+            self.unused_parts.discard(part)
+            self.config_entry.async_create_task(
+                self.hass, self.async_request_refresh(), "hypontech demand refresh"
+            )
+
+        @callback
+        def remove_consumer() -> None:
+            self._consumers[part] -= 1
+            self._live_plant_consumers -= live
+
+        return remove_consumer
+
+    @callback
+    def _async_wanted_parts(self, now: datetime) -> set[DataPart]:
+        """Return the parts of the data to fetch.
+
+        Everything is fetched until the cloud confirmed the data once, as the
+        entities are created from it. After that a part is fetched for its
+        entities and threshold rules, and otherwise only once in a while.
+        """
+        if self.data is None or self.data.stale:
+            return set(DataPart)
+        wanted = {part for part, count in self._consumers.items() if count}
+        wanted.update(
+            DataPart(rule[CONF_TARGET])
+            for rule in self.config_entry.options.get(CONF_RULES, ())
+        )
+        unused_interval = timedelta(seconds=UNUSED_PART_INTERVAL)
+        for part, fetched_at in (
+            (DataPart.OVERVIEW, self._overview_fetched_at),
+            (DataPart.PLANTS, self._plants_fetched_at),
+        ):
+            if fetched_at is None or now - fetched_at >= unused_interval:
+                wanted.add(part)
+        return wanted
+
+    @callback
+    def _async_plants_due(self) -> bool:
+        """Return if the plant list is due."""
+        return (
+            self._plants_due is None
+            or dt_util.utcnow() >= self._plants_due
+            or self.data.stale
+            or self._async_plant_power_used()
+        )
+
+    @callback
+    def _async_plant_power_used(self) -> bool:
+        """Return if entities or threshold rules follow the power of plants."""
+        return self._live_plant_consumers > 0 or any(
+            rule[CONF_TARGET] == RuleTarget.PLANTS
+            and rule[CONF_METRIC] == RuleMetric.POWER
+            for rule in self.config_entry.options.get(CONF_RULES, ())
+        )
+
+    async def async_refresh_on_demand(self) -> datetime | None:
+        """Refresh now and return when the cloud last answered.
+
+        Requests made while an update runs wait for that update instead of
+        starting another one, and requests made shortly after an update
+        return its result, so bursts of requests cost a single round trip.
+        """
+        if self._updating is not None:
+            await asyncio.shield(self._updating)
+            return self.last_fetched
+        spacing = timedelta(
+            seconds=self.config_entry.options.get(
+                CONF_REFRESH_SPACING, DEFAULT_REFRESH_SPACING
+            )
+        )
+        # Spaced from the last attempt, so an outage is not hammered either.
+        if (
+            self._last_attempt is None
+            or dt_util.utcnow() - self._last_attempt >= spacing
+        ):
+            await self.async_refresh()
+        return self.last_fetched
 
     async def _async_update_data(self) -> HypontechCoordinatorData:
+        # Refreshes take turns under the debouncer's lock, so one future
+        # covers the update running for the requests coalescing on it.
+        self._updating = self.hass.loop.create_future()
+        self._last_attempt = dt_util.utcnow()
         try:
-            overview = await self.api.get_overview()
-            plants = await self.api.get_list()
-        except RequestError as ex:
+            return await self._async_fetch_data()
+        finally:
+            self._updating.set_result(None)
+            self._updating = None
+            for update_callback in list(self._diagnostics_listeners):
+                update_callback()
+
+    async def _async_iter_plant_pages(
+        self,
+    ) -> AsyncIterator[tuple[list[PlantData] | None, list[str]]]:
+        """Yield the plants and plant IDs of the plant list, page by page.
+
+        The list is taken up at the page the last pass over it stopped at,
+        so a list too long for one update is fetched over several. A page
+        with the same fingerprint as before is not parsed again and yields
+        no plants, only the IDs it held. Its new fingerprint is only kept
+        once the page was merged.
+        """
+        while True:
+            page = self._next_plant_page
+            record = self._plant_pages.get(page)
+            result = await self._async_timed_fetch(
+                "get_list",
+                partial(
+                    async_get_plant_page,
+                    self.api,
+                    self.sessions.http_session,
+                    page,
+                    record.fingerprint if record else None,
+                ),
+            )
+            if result.plants is None and record is not None:
+                yield None, record.plant_ids
+            else:
+                plants = result.plants or []
+                parsed = _PlantPageRecord(
+                    result.fingerprint,
+                    result.page_count,
+                    [plant.plant_id for plant in plants],
+                )
+                yield plants, parsed.plant_ids
+                record = self._plant_pages[page] = parsed
+            if page >= record.page_count or not record.plant_ids:
+                break
+            self._next_plant_page = page + 1
+        self._next_plant_page = 1
+        for stale_page in [number for number in self._plant_pages if number > page]:
+            del self._plant_pages[stale_page]
+
+    async def _async_fetch_plants(self) -> bool:
+        """Merge the plant list into the plants in place.
+
+        Return True once the whole list was fetched. Memory stays bounded by
+        the page size, and the event loop gets a turn between pages. When a
+        page fails, or the update runs out of time, the pages merged so far
+        are kept and the next update goes on from the failed page. Until the
+        pass is complete the plants are shown with the age of the last one.
+        Plants deselected in the options are dropped here, before they are
+        stored or dispatched.
+        """
+        options = self.config_entry.options
+        seen = self._seen_plant_ids
+        async for page, plant_ids in self._async_iter_plant_pages():
+            if page is None:
+                seen.update(plant_ids)
+                continue
+            for plant in page:
+                if not plant_included(options, plant.plant_id, plant.plant_name):
+                    continue
+                seen.add(plant.plant_id)
+                added = plant.plant_id not in self.plants
+                if not self.plants.update(plant):
+                    continue
+                if added:
+                    self._changed_contexts.add(PLANT_LIST_CONTEXT)
+                self._changed_contexts.add(plant.plant_id)
+            await asyncio.sleep(0)
+        for plant_id in self.plants.index.keys() - seen:
+            self.plants.remove(plant_id)
+            self._changed_contexts.update((plant_id, PLANT_LIST_CONTEXT))
+        seen.clear()
+        return True
+
+    async def _async_fetch_part[T](
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[T]],
+        deadline: float,
+    ) -> T | None:
+        """Fetch the overview or the plant list within the update deadline.
+
+        When the fetch fails and there is data the cloud confirmed before,
+        None is returned, so the other part can still update while this
+        part keeps its last values.
+        """
+        try:
+            async with asyncio.timeout_at(deadline):
+                return await fetch()
+        except (RequestError, TimeoutError) as err:
+            if self.data is None or self.data.stale:
+                raise
+            LOGGER.debug("Keeping the last Hypontech %s: %s", name, err)
+            return None
+
+    async def _async_fetch_data(self) -> HypontechCoordinatorData:
+        """Fetch the data from the cloud."""
+        wanted = self._async_wanted_parts(dt_util.utcnow())
+        self.unused_parts = set(DataPart) - wanted
+        fetch_overview = DataPart.OVERVIEW in wanted
+        fetch_plants = DataPart.PLANTS in wanted and self._async_plants_due()
+        if not fetch_overview and not fetch_plants:
+            # Nothing due that anything uses: leave the cloud alone.
+            assert self.data is not None
+            self.update_interval = self._async_next_interval()
+            return self.data
+
+        if not self.breaker.async_allow_request():
+            self.update_interval = self._async_next_interval()
             raise UpdateFailed(
-                translation_domain=DOMAIN, translation_key="connection_error"
-            ) from ex
-        return HypontechCoordinatorData(
+                translation_domain=DOMAIN, translation_key="circuit_open"
+            )
+
+        start = monotonic()
+        self.throttle_wait = 0.0
+        self.metrics.start_update()
+        deadline = self.hass.loop.time() + UPDATE_DEADLINE
+        plant_page = self._next_plant_page
+        try:
+            # Refresh the token up front so the concurrent calls share it.
+            async with asyncio.timeout_at(deadline):
+                await self.throttle.async_wait_login(self.api)
+                await self._async_login()
+            async with asyncio.TaskGroup() as group:
+                overview_task = (
+                    group.create_task(
+                        self._async_fetch_part(
+                            "overview",
+                            partial(
+                                self._async_timed_fetch,
+                                "get_overview",
+                                partial(self.api.get_overview, retries=0),
+                            ),
+                            deadline,
+                        )
+                    )
+                    if fetch_overview
+                    else None
+                )
+                plants_task = (
+                    group.create_task(
+                        self._async_fetch_part(
+                            "plant list", self._async_fetch_plants, deadline
+                        )
+                    )
+                    if fetch_plants
+                    else None
+                )
+        except* (
+            AuthenticationError,
+            RateLimitError,
+            RequestError,
+            TimeoutError,
+        ) as ex:
+            self._async_raise_update_error(ex)
+        LOGGER.debug(
+            "Fetched Hypontech data in %.3fs (%s), %.3fs waiting for other accounts",
+            monotonic() - start,
+            ", ".join(
+                f"{name}: {duration:.3f}s"
+                for name, duration in self.fetch_durations.items()
+            ),
+            self.throttle_wait,
+        )
+        overview = overview_task.result() if overview_task is not None else None
+        fetched = plants_task.result() if plants_task is not None else False
+        now = dt_util.utcnow()
+        # Pages merged on the way through a long plant list are an answer too.
+        plants_progressed = fetched or self._next_plant_page != plant_page
+        if overview is None and not plants_progressed:
+            # Nothing came through: count it against the cloud, but keep
+            # showing the last data until the circuit breaker opens.
+            self.breaker.async_record_failure(rate_limited=False)
+        else:
+            self.sessions.async_token_accepted(self.config_entry.data[CONF_USERNAME])
+            self.breaker.async_record_success()
+            self.last_fetched = now
+
+        overview_fetched_at: datetime | None = None
+        if overview_task is None:
+            # Left out, the last overview stays as it was.
+            assert self.data is not None
+            overview = self.data.overview
+            overview_fetched_at = self.data.overview_fetched_at
+            if fetched:
+                # The plants tell whether the account still produces.
+                plants = self.plants
+                self.scheduler.async_record_power(
+                    sum(plants.power[slot] for slot in plants.index.values())
+                )
+        elif overview is None:
+            assert self.data is not None
+            overview = self.data.overview
+            overview_fetched_at = self._overview_fetched_at
+        else:
+            self._overview_fetched_at = now
+            changed = self.data is not None and overview != self.data.overview
+            if self.data is None or changed:
+                self._changed_contexts.add(None)
+            # The rolling figures move on with every reading.
+            if self.overview_history.add(
+                now.timestamp(), overview.power, overview.e_today
+            ):
+                self._changed_contexts.add(None)
+            self.scheduler.async_record_power(overview.power)
+            self.scheduler.async_record_poll(now, changed)
+        plants_fetched_at: datetime | None = None
+        if fetched is None:
+            plants_fetched_at = self._plants_fetched_at
+        elif fetched:
+            self._plants_fetched_at = now
+            self._plants_due = now + timedelta(seconds=PLANT_LIST_INTERVAL)
+            self._async_remove_missing_plants(self.plants)
+        self.update_interval = self._async_next_interval()
+
+        if self.data is not None:
+            # Entities show whether their part is kept at older values.
+            if overview_fetched_at != self.data.overview_fetched_at:
+                self._changed_contexts.add(None)
+            if plants_fetched_at != self.data.plants_fetched_at:
+                self._changed_contexts.update(self.plants)
+                self._changed_contexts.add(FLEET_CONTEXT)
+        if self.data is not None and not self.data.stale and not self._changed_contexts:
+            # Nothing changed: keep the current data and notify nobody.
+            self.skipped_updates += 1
+            return self.data
+
+        self._snapshot.async_delay_save(self._async_snapshot_data, SNAPSHOT_SAVE_DELAY)
+        fleet = self.data.fleet if self.data is not None else FleetStats()
+        if fetched and (fleet_stats := compute_fleet_stats(self.plants)) != fleet:
+            fleet = fleet_stats
+            self._changed_contexts.add(FLEET_CONTEXT)
+        data = HypontechCoordinatorData(
             overview=overview,
-            plants={plant.plant_id: plant for plant in plants},
+            plants=self.plants,
+            fleet=fleet,
+            overview_fetched_at=overview_fetched_at,
+            plants_fetched_at=plants_fetched_at,
+        )
+        self.rules.async_evaluate(
+            self.config_entry.options, data, self.scheduler.async_is_daylight()
         )
+        return data
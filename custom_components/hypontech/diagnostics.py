@@ -0,0 +1,66 @@
+"""Diagnostics support for the Hypontech Cloud integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .coordinator import HypontechConfigEntry
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "plant_name",
+    "title",
+    "unique_id",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: HypontechConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    breaker = coordinator.breaker
+    cadence = coordinator.scheduler.cadence
+    throttle = coordinator.throttle
+    slot = throttle.async_slot(entry.entry_id)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "suppressed_updates": coordinator.suppressed_updates,
+        "skipped_updates": coordinator.skipped_updates,
+        "circuit_breaker": {
+            "state": breaker.state,
+            "consecutive_failures": breaker.consecutive_failures,
+            "open_until": breaker.open_until,
+        },
+        "schedule": {
+            "slot": slot and slot[0],
+            "accounts": slot and slot[1],
+            "next_update": coordinator.next_update,
+            "throttle_wait": coordinator.throttle_wait,
+            "requests_in_flight": throttle.in_flight,
+            "unused_parts": sorted(coordinator.unused_parts),
+        },
+        "cloud_cadence": {
+            "period": cadence.period,
+            "locked": cadence.locked,
+            "probing": cadence.probing,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "data": async_redact_data(
+            {
+                "stale": coordinator.data.stale,
+                "overview_fetched_at": coordinator.data.overview_fetched_at,
+                "plants_fetched_at": coordinator.data.plants_fetched_at,
+                "overview": coordinator.data.overview.to_dict(),
+                "plants": coordinator.data.plants.as_dicts(),
+            },
+            TO_REDACT,
+        ),
+    }
@@ -2,23 +2,85 @@
 
 from __future__ import annotations
 
-from hyponcloud import PlantData
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import HypontechDataCoordinator
+from .const import ATTR_FETCHED_AT, ATTR_STALE, DOMAIN
+from .coordinator import DataPart, HypontechDataCoordinator
 
 
-class HypontechEntity(CoordinatorEntity[HypontechDataCoordinator]):
-    """Base entity for Hypontech Cloud."""
+@dataclass(frozen=True, slots=True)
+class PlantDevice:
+    """The device of a plant, built once and shared by all its entities."""
+
+    plant_id: str
+    slot: int
+    device_info: DeviceInfo
+
+
+def plant_device(plant_id: str, slot: int, name: str) -> PlantDevice:
+    """Return the device of a plant."""
+    return PlantDevice(
+        plant_id,
+        slot,
+        DeviceInfo(
+            identifiers={(DOMAIN, plant_id)},
+            name=name,
+            manufacturer="Hypontech",
+        ),
+    )
+
+
+class HypontechBaseEntity(CoordinatorEntity[HypontechDataCoordinator]):
+    """Common base for Hypontech Cloud entities."""
 
     _attr_has_entity_name = True
+    # The part of the data the entity shows, fetched only while used.
+    _data_part: DataPart | None = None
+    # Whether the entity shows the power of plants, which is kept live.
+    _live_plant_power = False
+
+    async def async_added_to_hass(self) -> None:
+        """Let the coordinator know the data is used."""
+        await super().async_added_to_hass()
+        if self._data_part is not None:
+            self.async_on_remove(
+                self.coordinator.async_add_consumer(
+                    self._data_part, live=self._live_plant_power
+                )
+            )
+
+    @property
+    def _fetched_at(self) -> datetime | None:
+        """Return when the values were fetched, if they could not be refreshed."""
+        return self.coordinator.data.overview_fetched_at
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values the cloud has not confirmed with the last update.
+
+        Values restored from disk are flagged, as well as values kept from
+        an earlier update when their call failed, together with their age.
+        """
+        if self.coordinator.data.stale:
+            return {ATTR_STALE: True}
+        if (fetched_at := self._fetched_at) is not None:
+            return {ATTR_STALE: True, ATTR_FETCHED_AT: fetched_at.isoformat()}
+        return None
+
 
-    def __init__(self, coordinator: HypontechDataCoordinator) -> None:
+class HypontechEntity(HypontechBaseEntity):
+    """Base entity for Hypontech Cloud."""
+
+    def __init__(
+        self, coordinator: HypontechDataCoordinator, context: Any = None
+    ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
             name="Overview",
@@ -26,28 +88,32 @@ class HypontechEntity(CoordinatorEntity[HypontechDataCoordinator]):
         )
 
 
-class HypontechPlantEntity(CoordinatorEntity[HypontechDataCoordinator]):
+class HypontechPlantEntity(HypontechBaseEntity):
     """Base entity for Hypontech Cloud plant."""
 
-    _attr_has_entity_name = True
+    _data_part = DataPart.PLANTS
 
-    def __init__(self, coordinator: HypontechDataCoordinator, plant_id: str) -> None:
+    def __init__(
+        self, coordinator: HypontechDataCoordinator, device: PlantDevice
+    ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
-        self.plant_id = plant_id
-        plant = coordinator.data.plants[plant_id]
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, plant_id)},
-            name=plant.plant_name,
-            manufacturer="Hypontech",
-        )
+        super().__init__(coordinator, context=device.plant_id)
+        self.plant_id = device.plant_id
+        self._slot: int | None = device.slot
+        self._attr_device_info = device.device_info
+
+    @property
+    def _fetched_at(self) -> datetime | None:
+        """Return when the values were fetched, if they could not be refreshed."""
+        return self.coordinator.data.plants_fetched_at
 
     @property
-    def plant(self) -> PlantData | None:
-        """Return the plant data."""
-        return self.coordinator.data.plants.get(self.plant_id)
+    def slot(self) -> int | None:
+        """Return the slot of the plant in the plant columns."""
+        self._slot = self.coordinator.data.plants.slot(self.plant_id, self._slot)
+        return self._slot
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return super().available and self.plant is not None
+        return super().available and self.slot is not None
@@ -0,0 +1,71 @@
+"""Fleet wide figures computed over all plants of an account."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import heapq
+from statistics import median
+
+from .plants import PlantColumns
+
+# Plants listed as top producers.
+TOP_PRODUCERS = 5
+
+# A plant underperforms when its output, relative to its own peak, is below
+# this share of the median of its peers.
+UNDERPERFORMANCE_RATIO = 0.5
+
+# Peers must produce at least this share of their peak before plants are
+# compared, so dawn, dusk and clouds do not flag plants.
+MIN_FLEET_OUTPUT = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class FleetStats:
+    """Aggregates over the plants of an account."""
+
+    # Plant IDs of the largest producers, largest first.
+    top_producers: tuple[str, ...] = ()
+    # Energy today per kW of observed peak power, in kWh/kW.
+    specific_yield_min: float | None = None
+    specific_yield_median: float | None = None
+    specific_yield_max: float | None = None
+    underperformers: tuple[str, ...] = ()
+
+
+def compute_fleet_stats(plants: PlantColumns) -> FleetStats:
+    """Compute the fleet aggregates in one pass over the plant columns.
+
+    Hypon Cloud does not report the capacity of a plant, so the highest
+    power seen from a plant stands in for it to normalize yield and output.
+    """
+    slots = list(plants.index.values())
+    top = heapq.nlargest(
+        TOP_PRODUCERS,
+        (slot for slot in slots if plants.power[slot] > 0),
+        key=plants.power.__getitem__,
+    )
+
+    yields: list[float] = []
+    outputs: list[tuple[float, int]] = []
+    for slot in slots:
+        if (peak := plants.peak_power[slot]) <= 0:
+            continue
+        yields.append(plants.e_today[slot] * 1000 / peak)
+        outputs.append((plants.power[slot] / peak, slot))
+    if not yields:
+        return FleetStats(top_producers=tuple(plants.ids[slot] for slot in top))
+
+    underperformers: tuple[str, ...] = ()
+    if (fleet_output := median(output for output, _ in outputs)) >= MIN_FLEET_OUTPUT:
+        threshold = fleet_output * UNDERPERFORMANCE_RATIO
+        underperformers = tuple(
+            plants.ids[slot] for output, slot in outputs if output < threshold
+        )
+    return FleetStats(
+        top_producers=tuple(plants.ids[slot] for slot in top),
+        specific_yield_min=round(min(yields), 3),
+        specific_yield_median=round(median(yields), 3),
+        specific_yield_max=round(max(yields), 3),
+        underperformers=underperformers,
+    )
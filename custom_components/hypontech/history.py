@@ -0,0 +1,130 @@
+"""Recent samples of the overview, for rolling figures."""
+
+from __future__ import annotations
+
+from array import array
+
+# Windows of the rolling mean power, in minutes.
+MEAN_POWER_WINDOWS = (5, 15, 60)
+
+# Samples kept per subject. At the shortest polling interval this covers
+# the longest window.
+HISTORY_SIZE = 128
+
+
+class SampleRing:
+    """A fixed size ring buffer of power and energy samples.
+
+    Power is held between samples, so a reading is only stored when a
+    figure changed, but every reading moves the windows on: they end at the
+    time of the last reading. Next to every sample the integral of the power
+    since the first one is stored, and every window keeps a cursor on its
+    oldest sample, so the rolling figures cost O(1) per reading, amortized.
+    """
+
+    __slots__ = (
+        "_count",
+        "_cursors",
+        "_e_today",
+        "_integral",
+        "_last_e_today",
+        "_last_power",
+        "_last_time",
+        "_power",
+        "_times",
+        "interval_energy",
+        "mean_power",
+        "power_derivative",
+    )
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        """Initialize the ring buffer."""
+        self._times = array("d", bytes(8 * size))
+        self._power = array("d", bytes(8 * size))
+        self._e_today = array("d", bytes(8 * size))
+        self._integral = array("d", bytes(8 * size))
+        # Samples stored so far; sample n is stored at n % size.
+        self._count = 0
+        self._cursors = [0] * len(MEAN_POWER_WINDOWS)
+        # The last reading, stored or not.
+        self._last_time = 0.0
+        self._last_power = 0.0
+        self._last_e_today = 0.0
+        # Mean power in W over each window, in the order of the windows.
+        self.mean_power: list[float | None] = [None] * len(MEAN_POWER_WINDOWS)
+        # Change of power in W per minute between the last two readings.
+        self.power_derivative: float | None = None
+        # Energy in kWh produced between the last two readings.
+        self.interval_energy: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self._count, len(self._times))
+
+    def add(self, timestamp: float, power: float, e_today: float) -> bool:
+        """Record a reading, returning if the rolling figures changed."""
+        size = len(self._times)
+        figures = (self.mean_power, self.power_derivative, self.interval_energy)
+        if self._count:
+            elapsed = timestamp - self._last_time
+            self.power_derivative = (
+                round((power - self._last_power) * 60 / elapsed, 1)
+                if elapsed > 0
+                else None
+            )
+            # Today energy restarts at midnight.
+            energy = e_today - self._last_e_today
+            self.interval_energy = round(energy if energy >= 0 else e_today, 3)
+        self._last_time = timestamp
+        self._last_power = power
+        self._last_e_today = e_today
+
+        newest = (self._count - 1) % size
+        if (
+            not self._count
+            or power != self._power[newest]
+            or e_today != self._e_today[newest]
+        ):
+            integral = 0.0
+            if self._count:
+                integral = self._integral[newest] + self._power[newest] * (
+                    timestamp - self._times[newest]
+                )
+            newest = self._count % size
+            self._times[newest] = timestamp
+            self._power[newest] = power
+            self._e_today[newest] = e_today
+            self._integral[newest] = integral
+            self._count += 1
+
+        last = self._count - 1
+        oldest = max(0, self._count - size)
+        mean_power: list[float | None] = []
+        for window, minutes in enumerate(MEAN_POWER_WINDOWS):
+            start = timestamp - minutes * 60
+            # Move to the last sample taken at or before the window start.
+            cursor = max(self._cursors[window], oldest)
+            while cursor < last and self._times[(cursor + 1) % size] <= start:
+                cursor += 1
+            self._cursors[window] = cursor
+            mean_power.append(self._mean(cursor % size, start, newest, timestamp))
+        self.mean_power = mean_power
+        return figures != (mean_power, self.power_derivative, self.interval_energy)
+
+    def _mean(self, first: int, start: float, newest: int, end: float) -> float | None:
+        """Return the mean power from a window start to its end.
+
+        When the samples do not reach back to the start of the window, the
+        mean covers the time they do.
+        """
+        since = self._times[first]
+        integral = self._integral[first]
+        if since < start:
+            integral += self._power[first] * (start - since)
+            since = start
+        if (duration := end - since) <= 0:
+            return None
+        total = self._integral[newest] + self._power[newest] * (
+            end - self._times[newest]
+        )
+        return round((total - integral) / duration, 1)
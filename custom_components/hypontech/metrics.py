@@ -0,0 +1,117 @@
+"""Request metrics for the Hypontech Cloud integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import math
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, TraceResponseChunkReceivedParams
+
+# Number of recent requests the latency percentiles are computed over.
+LATENCY_WINDOW = 256
+
+_current_call: ContextVar[CallMetrics | None] = ContextVar(
+    "hypontech_current_call", default=None
+)
+
+
+@dataclass
+class CallMetrics:
+    """Rolling metrics of one kind of cloud call."""
+
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_WINDOW)
+    )
+    successes: int = 0
+    errors: int = 0
+    response_size: int = 0
+    received: int = field(default=0, repr=False)
+
+    def latency_percentile(self, percent: float) -> float | None:
+        """Return a latency percentile in milliseconds, by nearest rank."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return round(ordered[rank - 1] * 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p95_ms": self.latency_percentile(95),
+            "latency_p99_ms": self.latency_percentile(99),
+            "successes": self.successes,
+            "errors": self.errors,
+            "response_size": self.response_size,
+        }
+
+
+class HypontechMetrics:
+    """Latency, outcome and size metrics per cloud call."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.calls: dict[str, CallMetrics] = {}
+
+    def get(self, name: str) -> CallMetrics:
+        """Return the metrics of a call, creating them on first use."""
+        if (call := self.calls.get(name)) is None:
+            call = self.calls[name] = CallMetrics()
+        return call
+
+    def start_update(self) -> None:
+        """Start counting the response bytes of a new update.
+
+        A call made several times in an update, like the pages of the plant
+        list, reports the bytes of all of them.
+        """
+        for call in self.calls.values():
+            call.received = 0
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[CallMetrics]:
+        """Attribute the response bytes received in this block to a call."""
+        call = self.get(name)
+        token = _current_call.set(call)
+        try:
+            yield call
+        finally:
+            _current_call.reset(token)
+            call.response_size = call.received
+
+    def record(self, name: str, duration: float, success: bool) -> None:
+        """Record the outcome of one attempt of a call."""
+        call = self.get(name)
+        call.latencies.append(duration)
+        if success:
+            call.successes += 1
+        else:
+            call.errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {name: call.as_dict() for name, call in self.calls.items()}
+
+
+async def _on_response_chunk_received(
+    session: ClientSession,
+    trace_config_ctx: SimpleNamespace,
+    params: TraceResponseChunkReceivedParams,
+) -> None:
+    """Count the response bytes of the call being measured."""
+    if (call := _current_call.get()) is not None:
+        call.received += len(params.chunk)
+
+
+def create_trace_config() -> TraceConfig:
+    """Return an aiohttp trace config measuring response sizes."""
+    trace_config = TraceConfig()
+    trace_config.on_response_chunk_received.append(_on_response_chunk_received)
+    return trace_config
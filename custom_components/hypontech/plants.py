@@ -0,0 +1,118 @@
+"""Compact storage of the plant figures."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+from hyponcloud import PlantData
+
+
+class PlantColumns:
+    """The plants of an account, stored column by column.
+
+    Every plant gets a slot in the columns when it is first seen and keeps
+    it while it is on the account, so entities can read their figures by
+    slot. The slots of removed plants go to plants added later, so the
+    columns do not grow as plants come and go. Next to the figures of the
+    last update, the highest power seen from each plant is kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the columns."""
+        self.index: dict[str, int] = {}
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.power = array("q")
+        self.e_today = array("d")
+        self.e_total = array("d")
+        self.peak_power = array("q")
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of plants."""
+        return len(self.index)
+
+    def __contains__(self, plant_id: object) -> bool:
+        """Return if a plant is stored."""
+        return plant_id in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the plant IDs."""
+        return iter(self.index)
+
+    def slot(self, plant_id: str, hint: int | None = None) -> int | None:
+        """Return the slot of a plant, checking a previously returned one first."""
+        if hint is not None and hint < len(self.ids) and self.ids[hint] == plant_id:
+            return hint
+        return self.index.get(plant_id)
+
+    def update(self, plant: PlantData, peak_power: int = 0) -> bool:
+        """Store the figures of a plant and return if they changed."""
+        power = round(plant.power)
+        if (slot := self.index.get(plant.plant_id)) is None and self._free:
+            slot = self.index[plant.plant_id] = self._free.pop()
+            self.ids[slot] = plant.plant_id
+            self.names[slot] = plant.plant_name
+            self.power[slot] = power
+            self.e_today[slot] = plant.e_today
+            self.e_total[slot] = plant.e_total
+            self.peak_power[slot] = max(power, peak_power)
+            return True
+        if slot is None:
+            self.index[plant.plant_id] = len(self.ids)
+            self.ids.append(plant.plant_id)
+            self.names.append(plant.plant_name)
+            self.power.append(power)
+            self.e_today.append(plant.e_today)
+            self.e_total.append(plant.e_total)
+            self.peak_power.append(max(power, peak_power))
+            return True
+        if power > self.peak_power[slot]:
+            self.peak_power[slot] = power
+        if (
+            self.power[slot] == power
+            and self.e_today[slot] == plant.e_today
+            and self.e_total[slot] == plant.e_total
+            and self.names[slot] == plant.plant_name
+        ):
+            return False
+        self.names[slot] = plant.plant_name
+        self.power[slot] = power
+        self.e_today[slot] = plant.e_today
+        self.e_total[slot] = plant.e_total
+        return True
+
+    def remove(self, plant_id: str) -> None:
+        """Remove a plant and free its slot."""
+        slot = self.index.pop(plant_id)
+        self.ids[slot] = ""
+        self.names[slot] = ""
+        self._free.append(slot)
+
+    def get(self, plant_id: str) -> PlantData | None:
+        """Return the figures of a plant as the library's data class."""
+        if (slot := self.index.get(plant_id)) is None:
+            return None
+        return PlantData(
+            plant_id=plant_id,
+            plant_name=self.names[slot],
+            power=self.power[slot],
+            e_today=self.e_today[slot],
+            e_total=self.e_total[slot],
+        )
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        """Return the plants as dictionaries, e.g. to store them."""
+        return [
+            {
+                "plant_id": plant_id,
+                "plant_name": self.names[slot],
+                "power": self.power[slot],
+                "e_today": self.e_today[slot],
+                "e_total": self.e_total[slot],
+                "peak_power": self.peak_power[slot],
+            }
+            for plant_id, slot in self.index.items()
+        ]
@@ -0,0 +1,82 @@
+"""Backoff and circuit breaker for Hypontech Cloud requests."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from enum import StrEnum
+import random
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import BREAKER_BASE_DELAY, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_DELAY
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Return the next backoff delay, spread so clients do not retry in lockstep."""
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class HypontechCircuitBreaker:
+    """Stop calling the cloud after repeated failures and probe for recovery.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failed updates, or a single
+    rate-limited one, the breaker opens for a jittered, growing delay. Once
+    the delay is over one probe is let through: its success closes the
+    breaker, its failure opens it again for longer.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.open_until: datetime | None = None
+        self._delay = float(BREAKER_BASE_DELAY)
+
+    @callback
+    def async_allow_request(self) -> bool:
+        """Return if a request may be sent now."""
+        if self.state is BreakerState.OPEN:
+            assert self.open_until is not None
+            if dt_util.utcnow() < self.open_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    @callback
+    def async_retry_in(self) -> timedelta:
+        """Return the time until the breaker lets a probe through."""
+        if self.state is not BreakerState.OPEN or self.open_until is None:
+            return timedelta(0)
+        return max(timedelta(0), self.open_until - dt_util.utcnow())
+
+    @callback
+    def async_record_success(self) -> None:
+        """Record a successful update."""
+        self.consecutive_failures = 0
+        self.open_until = None
+        self._delay = float(BREAKER_BASE_DELAY)
+        self.state = BreakerState.CLOSED
+
+    @callback
+    def async_record_failure(self, rate_limited: bool = False) -> None:
+        """Record a failed update."""
+        self.consecutive_failures += 1
+        if (
+            rate_limited
+            or self.state is BreakerState.HALF_OPEN
+            or self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD
+        ):
+            self._delay = decorrelated_jitter(
+                self._delay, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY
+            )
+            self.open_until = dt_util.utcnow() + timedelta(seconds=self._delay)
+            self.state = BreakerState.OPEN
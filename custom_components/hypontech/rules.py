@@ -0,0 +1,185 @@
+"""Threshold rules evaluated on every update of the Hypontech Cloud data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_CONDITION,
+    CONF_DAYLIGHT_ONLY,
+    CONF_HYSTERESIS,
+    CONF_METRIC,
+    CONF_RULE_ID,
+    CONF_RULES,
+    CONF_TARGET,
+    CONF_THRESHOLD,
+    EVENT_THRESHOLD_CLEARED,
+    EVENT_THRESHOLD_TRIGGERED,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import HypontechCoordinatorData
+
+
+class RuleTarget(StrEnum):
+    """What a rule looks at."""
+
+    OVERVIEW = "overview"
+    PLANTS = "plants"
+
+
+class RuleMetric(StrEnum):
+    """The figure a rule compares."""
+
+    POWER = "power"
+    E_TODAY = "e_today"
+    E_TOTAL = "e_total"
+
+
+class RuleCondition(StrEnum):
+    """When a rule is triggered."""
+
+    BELOW = "below"
+    ABOVE = "above"
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdRule:
+    """A threshold on a figure of the overview or of every plant.
+
+    The rule is triggered when the figure crosses the threshold and only
+    cleared once it is back past the threshold by the hysteresis, so a
+    figure hovering around the threshold does not fire a stream of events.
+    """
+
+    rule_id: str
+    name: str
+    target: RuleTarget
+    metric: RuleMetric
+    condition: RuleCondition
+    threshold: float
+    hysteresis: float = 0.0
+    daylight_only: bool = False
+
+    @classmethod
+    def from_dict(cls, rule: Mapping[str, Any]) -> ThresholdRule:
+        """Return a rule from its options."""
+        return cls(
+            rule_id=rule[CONF_RULE_ID],
+            name=rule[CONF_NAME],
+            target=RuleTarget(rule[CONF_TARGET]),
+            metric=RuleMetric(rule[CONF_METRIC]),
+            condition=RuleCondition(rule[CONF_CONDITION]),
+            threshold=rule[CONF_THRESHOLD],
+            hysteresis=rule.get(CONF_HYSTERESIS, 0.0),
+            daylight_only=rule.get(CONF_DAYLIGHT_ONLY, False),
+        )
+
+    def is_triggered(self, value: float, active: bool) -> bool:
+        """Return if the rule is triggered by a value, given its last state."""
+        if self.condition is RuleCondition.BELOW:
+            limit = self.threshold + self.hysteresis if active else self.threshold
+            return value < limit
+        limit = self.threshold - self.hysteresis if active else self.threshold
+        return value > limit
+
+
+class HypontechRuleEngine:
+    """Evaluate the threshold rules of a config entry and fire events.
+
+    Events are only fired on transitions. The first evaluation of a rule,
+    also after daylight returns for daylight only rules, sets its state
+    without firing.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the rule engine."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self._rules: tuple[ThresholdRule, ...] = ()
+        self._options: Any = None
+        # Subjects, the plant ID or None for the overview, triggered per rule.
+        self._active: dict[str, set[str | None]] = {}
+
+    @callback
+    def async_load_rules(self, options: Mapping[str, Any]) -> tuple[ThresholdRule, ...]:
+        """Return the rules, parsing them again only when the options changed."""
+        rules = options.get(CONF_RULES, [])
+        if rules is not self._options:
+            self._options = rules
+            self._rules = tuple(ThresholdRule.from_dict(rule) for rule in rules)
+            ids = {rule.rule_id for rule in self._rules}
+            self._active = {
+                rule_id: active
+                for rule_id, active in self._active.items()
+                if rule_id in ids
+            }
+        return self._rules
+
+    @callback
+    def async_evaluate(
+        self,
+        options: Mapping[str, Any],
+        data: HypontechCoordinatorData,
+        daylight: bool,
+    ) -> None:
+        """Evaluate all rules in one pass over the data."""
+        for rule in self.async_load_rules(options):
+            if rule.daylight_only and not daylight:
+                self._active.pop(rule.rule_id, None)
+                continue
+            first = rule.rule_id not in self._active
+            active = self._active.setdefault(rule.rule_id, set())
+            for subject, name, value in _values(rule, data):
+                was_active = subject in active
+                if rule.is_triggered(value, was_active) == was_active:
+                    continue
+                if was_active:
+                    active.discard(subject)
+                else:
+                    active.add(subject)
+                if not first:
+                    self._async_fire(rule, subject, name, value, not was_active)
+
+    @callback
+    def _async_fire(
+        self,
+        rule: ThresholdRule,
+        plant_id: str | None,
+        name: str | None,
+        value: float,
+        triggered: bool,
+    ) -> None:
+        """Fire the event of a rule transition."""
+        self.hass.bus.async_fire(
+            EVENT_THRESHOLD_TRIGGERED if triggered else EVENT_THRESHOLD_CLEARED,
+            {
+                "config_entry_id": self.entry_id,
+                "rule_id": rule.rule_id,
+                "rule": rule.name,
+                "plant_id": plant_id,
+                "plant_name": name,
+                "metric": rule.metric,
+                "value": value,
+                "threshold": rule.threshold,
+            },
+        )
+
+
+def _values(
+    rule: ThresholdRule, data: HypontechCoordinatorData
+) -> Iterator[tuple[str | None, str | None, float]]:
+    """Yield the subject, name and value a rule compares."""
+    if rule.target is RuleTarget.OVERVIEW:
+        yield None, None, getattr(data.overview, rule.metric)
+        return
+    plants = data.plants
+    column = getattr(plants, rule.metric)
+    for plant_id, slot in plants.index.items():
+        yield plant_id, plants.names[slot], column[slot]
@@ -0,0 +1,267 @@
+"""Adaptive polling interval for the Hypontech Cloud integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import pairwise
+from statistics import median
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import SUN_EVENT_SUNRISE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.sun import get_astral_event_next, get_astral_location
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+)
+
+# Solar elevation in degrees above which the plants are expected to produce.
+PRODUCTION_ELEVATION = 0.0
+# Number of recent power readings that keep the fast interval alive.
+RECENT_POWER_SAMPLES = 3
+
+# Changes of the overview seen before the cloud's refresh period is trusted.
+CADENCE_SAMPLES = 8
+# Seconds after an expected cloud refresh before polling, to let it settle.
+CADENCE_MARGIN = 5.0
+# Seconds between the polls looking for a cloud refresh that is late.
+CADENCE_PROBE = 15.0
+# Seconds the cloud refresh may drift every period, on top of the error of
+# the learned period.
+CADENCE_DRIFT = 1.0
+# Where in the bounds of the next refresh it is polled, as a fraction of
+# their width. Most polls come after the refresh and narrow the bounds from
+# above, the rest come before it and narrow them from below.
+CADENCE_STAGGER = 0.8
+# Seconds of width below which the bounds are polled at their end, as
+# narrowing them further costs more misses than it saves in latency.
+CADENCE_RESOLUTION = 20.0
+# Refreshes apart the bounds must be to refine the period from them.
+CADENCE_REFINE = 4
+
+
+class UpstreamCadence:
+    """Learn the period and phase of the cloud's own data refresh.
+
+    The cloud refreshes the figures on a fixed cadence, so a poll right
+    after each refresh gets fresh data with the fewest requests. A change
+    seen by a poll happened since the previous poll. The period is first
+    learned from the changes seen at the regular interval, and the phase is
+    kept as the bounds of a refresh.
+
+    Once locked, there is one poll per refresh, staggered into the bounds
+    carried over from the refresh before, widened by the error of the
+    period and the drift allowed. A poll finding the figures changed
+    narrows the bounds from above and one finding them unchanged narrows
+    them from below, then is followed by a poll after the bounds. So the
+    bounds narrow over several refreshes well below the minimum interval
+    between polls, and the period is refined from bounds many refreshes
+    apart. A refresh missing from its bounds is probed for until it shows
+    up, and one found outside of them starts the learning over.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cadence."""
+        self.period: float | None = None
+        self._period_error = 0.0
+        # The bounds of each change seen while learning.
+        self._changes: deque[tuple[float, float]] = deque(maxlen=CADENCE_SAMPLES + 1)
+        self._last_poll: float | None = None
+        # Bounds of the time of a cloud refresh, past or upcoming, and
+        # whether a poll saw it already.
+        self._earliest = 0.0
+        self._latest = 0.0
+        self._seen = False
+        # Refreshes since the lock, and the bounds of the first one, to
+        # refine the period from.
+        self._cycle = 0
+        self._anchor: tuple[int, float, float] | None = None
+        self.locked = False
+        self.probing = False
+
+    def _next_bounds(self) -> tuple[float, float]:
+        """Return the bounds of the refresh after the one of the bounds."""
+        assert self.period is not None
+        spread = max(self._period_error, CADENCE_DRIFT)
+        return (
+            self._earliest + self.period - spread,
+            self._latest + self.period + spread,
+        )
+
+    def _fit(
+        self, cycles: int, first: tuple[float, float], last: tuple[float, float]
+    ) -> None:
+        """Set the period from the bounds of two refreshes cycles apart."""
+        self.period = (last[0] + last[1] - first[0] - first[1]) / 2 / cycles
+        self._period_error = (first[1] - first[0] + last[1] - last[0]) / 2 / cycles
+
+    def _lock(self, earliest: float, latest: float) -> None:
+        """Keep the bounds of a refresh seen, refining the period with them."""
+        self._earliest, self._latest = earliest, latest
+        self._seen = True
+        if self._anchor is None:
+            self._anchor = (self._cycle, earliest, latest)
+            return
+        cycles, anchor_earliest, anchor_latest = self._anchor
+        cycles = self._cycle - cycles
+        if (
+            cycles >= CADENCE_REFINE
+            and (anchor_latest - anchor_earliest + latest - earliest) / 2 / cycles
+            < self._period_error
+        ):
+            self._fit(cycles, (anchor_earliest, anchor_latest), (earliest, latest))
+
+    def _learn(self, previous: float, timestamp: float) -> None:
+        """Learn the period from a change seen at the regular interval."""
+        self._changes.append((previous, timestamp))
+        if len(self._changes) <= CADENCE_SAMPLES:
+            return
+        seen = [latest for _, latest in self._changes]
+        gaps = [later - earlier for earlier, later in pairwise(seen)]
+        step = median(gaps)
+        # Refreshes that did not change the figures leave longer gaps.
+        cycles = sum(max(1, round(gap / step)) for gap in gaps)
+        self._fit(cycles, self._changes[0], self._changes[-1])
+        assert self.period is not None
+        if timestamp - previous > self.period / 2:
+            return
+        self.locked = True
+        self._changes.clear()
+        self._cycle = 0
+        self._anchor = None
+        self._lock(previous, timestamp)
+
+    def record(self, timestamp: float, changed: bool) -> None:
+        """Record a poll and whether it found the figures changed."""
+        previous, self._last_poll = self._last_poll, timestamp
+        if previous is None:
+            return
+        if not self.locked:
+            if changed:
+                self._learn(previous, timestamp)
+            return
+
+        assert self.period is not None
+        while self._seen and timestamp >= self._latest + self.period / 2:
+            # A poll for a later refresh.
+            self._earliest, self._latest = self._next_bounds()
+            self._cycle += 1
+            self._seen = timestamp >= self._latest + self.period / 2
+        if not changed:
+            if self._seen:
+                return
+            if timestamp < self._latest:
+                # The refresh comes after this poll.
+                self._earliest = max(self._earliest, timestamp)
+            elif timestamp - self._latest < self.period / 2:
+                # The refresh is late, look for it.
+                self.probing = True
+            else:
+                # The figures just do not change, e.g. at dusk.
+                self.locked = self.probing = False
+            return
+
+        self.probing = False
+        if self._seen:
+            return
+        earliest = max(self._earliest, previous)
+        latest = min(self._latest, timestamp)
+        if earliest > latest:
+            # The refresh moved away from its bounds, learn it again.
+            self.locked = False
+            self._changes.clear()
+            self._changes.append((previous, timestamp))
+            return
+        self._lock(earliest, latest)
+
+    def next_poll(self, now: float, min_delay: float = 0.0) -> float | None:
+        """Return the seconds until the next poll, None while not locked.
+
+        Polls are never closer than the minimum delay: probes slow down to
+        it, and a poll lined up sooner moves to the next refresh.
+        """
+        if self.probing:
+            return max(CADENCE_PROBE, min_delay)
+        if not self.locked:
+            return None
+        assert self.period is not None
+        if not self._seen:
+            # The last poll came before the refresh, poll once it is there.
+            return max(self._latest + CADENCE_MARGIN - now, min_delay)
+        earliest, latest = self._next_bounds()
+        if latest - earliest <= CADENCE_RESOLUTION:
+            poll = latest
+        else:
+            poll = earliest + CADENCE_STAGGER * (latest - earliest)
+        while poll < now + min_delay:
+            poll += self.period
+        return poll - now
+
+
+class HypontechPollingScheduler:
+    """Pick the next polling interval from the sun and recent production."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.config_entry = config_entry
+        self._recent_power: deque[int] = deque(maxlen=RECENT_POWER_SAMPLES)
+        self.cadence = UpstreamCadence()
+
+    @property
+    def min_interval(self) -> timedelta:
+        """Return the interval used while the plants produce."""
+        return timedelta(
+            seconds=self.config_entry.options.get(
+                CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+            )
+        )
+
+    @property
+    def max_interval(self) -> timedelta:
+        """Return the interval used at night."""
+        return timedelta(
+            seconds=self.config_entry.options.get(
+                CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL
+            )
+        )
+
+    @callback
+    def async_record_power(self, power: int) -> None:
+        """Record the latest overview power reading."""
+        self._recent_power.append(power)
+
+    @callback
+    def async_record_poll(self, now: datetime, changed: bool) -> None:
+        """Record when the overview was polled and if its figures changed."""
+        self.cadence.record(now.timestamp(), changed)
+
+    @callback
+    def async_is_daylight(self, now: datetime | None = None) -> bool:
+        """Return if the sun is high enough for the plants to produce."""
+        if now is None:
+            now = dt_util.utcnow()
+        location, elevation = get_astral_location(self.hass)
+        return location.solar_elevation(now, elevation) > PRODUCTION_ELEVATION
+
+    @callback
+    def async_next_interval(self, now: datetime | None = None) -> timedelta:
+        """Return the delay until the next poll."""
+        if now is None:
+            now = dt_util.utcnow()
+        min_interval = self.min_interval
+        if any(self._recent_power) or self.async_is_daylight(now):
+            # Poll right after the cloud refreshes, once its cadence is known.
+            delay = self.cadence.next_poll(
+                now.timestamp(), min_interval.total_seconds()
+            )
+            return min_interval if delay is None else timedelta(seconds=delay)
+
+        # Nothing to see at night, but wake up at sunrise to catch the ramp-up.
+        until_sunrise = get_astral_event_next(self.hass, SUN_EVENT_SUNRISE, now) - now
+        return max(min_interval, min(self.max_interval, until_sunrise))
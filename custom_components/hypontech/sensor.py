@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import datetime
+from itertools import batched
+from time import monotonic
+from typing import Any
 
-from hyponcloud import OverviewData, PlantData
+from hyponcloud import OverviewData
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -13,12 +18,30 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
-from .coordinator import HypontechConfigEntry, HypontechDataCoordinator
-from .entity import HypontechEntity, HypontechPlantEntity
+from .const import LOGGER
+from .coordinator import (
+    FLEET_CONTEXT,
+    PLANT_LIST_CONTEXT,
+    DataPart,
+    HypontechConfigEntry,
+    HypontechDataCoordinator,
+)
+from .entity import HypontechEntity, HypontechPlantEntity, PlantDevice, plant_device
+from .fleet import FleetStats
+from .history import MEAN_POWER_WINDOWS, SampleRing
+from .plants import PlantColumns
+from .retry import BreakerState
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -32,7 +55,30 @@ class HypontechSensorDescription(SensorEntityDescription):
 class HypontechPlantSensorDescription(SensorEntityDescription):
     """Describes Hypontech plant sensor entity."""
 
-    value_fn: Callable[[PlantData], float | None]
+    value_fn: Callable[[PlantColumns, int], float | None]
+    live_power: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class HypontechFleetSensorDescription(SensorEntityDescription):
+    """Describes Hypontech fleet sensor entity."""
+
+    value_fn: Callable[[FleetStats, PlantColumns], StateType]
+    attr_fn: Callable[[FleetStats, PlantColumns], dict[str, Any]] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class HypontechRollingSensorDescription(SensorEntityDescription):
+    """Describes Hypontech sensor entity computed from recent samples."""
+
+    value_fn: Callable[[SampleRing], float | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class HypontechDiagnosticSensorDescription(SensorEntityDescription):
+    """Describes Hypontech connection diagnostic sensor entity."""
+
+    value_fn: Callable[[HypontechDataCoordinator], StateType]
 
 
 OVERVIEW_SENSORS: tuple[HypontechSensorDescription, ...] = (
@@ -67,7 +113,8 @@ PLANT_SENSORS: tuple[HypontechPlantSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda c: c.power,
+        value_fn=lambda plants, slot: plants.power[slot],
+        live_power=True,
     ),
     HypontechPlantSensorDescription(
         key="lifetime_energy",
@@ -75,7 +122,7 @@ PLANT_SENSORS: tuple[HypontechPlantSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda c: c.e_total,
+        value_fn=lambda plants, slot: plants.e_total[slot],
     ),
     HypontechPlantSensorDescription(
         key="today_energy",
@@ -83,11 +130,205 @@ PLANT_SENSORS: tuple[HypontechPlantSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda c: c.e_today,
+        value_fn=lambda plants, slot: plants.e_today[slot],
+    ),
+)
+
+
+def _mean_power(window: int, minutes: int) -> HypontechRollingSensorDescription:
+    """Return the description of a rolling mean power sensor."""
+    return HypontechRollingSensorDescription(
+        key=f"mean_power_{minutes}m",
+        translation_key="mean_power",
+        translation_placeholders={"minutes": str(minutes)},
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda ring: ring.mean_power[window],
+    )
+
+
+ROLLING_SENSORS: tuple[HypontechRollingSensorDescription, ...] = (
+    *(
+        _mean_power(window, minutes)
+        for window, minutes in enumerate(MEAN_POWER_WINDOWS)
+    ),
+    HypontechRollingSensorDescription(
+        key="power_derivative",
+        translation_key="power_derivative",
+        native_unit_of_measurement="W/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda ring: ring.power_derivative,
+    ),
+    HypontechRollingSensorDescription(
+        key="interval_energy",
+        translation_key="interval_energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=lambda ring: ring.interval_energy,
     ),
 )
 
 
+def _plant_list(plant_ids: Iterable[str], plants: PlantColumns) -> list[dict[str, Any]]:
+    """Return the name and power of plants, for state attributes."""
+    return [
+        {
+            "plant_id": plant_id,
+            "name": plants.names[slot],
+            "power": plants.power[slot],
+        }
+        for plant_id in plant_ids
+        if (slot := plants.slot(plant_id)) is not None
+    ]
+
+
+def _plant_name(plant_ids: tuple[str, ...], plants: PlantColumns) -> str | None:
+    """Return the name of the first of some plants."""
+    if not plant_ids or (slot := plants.slot(plant_ids[0])) is None:
+        return None
+    return plants.names[slot] or plant_ids[0]
+
+
+FLEET_SENSORS: tuple[HypontechFleetSensorDescription, ...] = (
+    HypontechFleetSensorDescription(
+        key="top_producer",
+        translation_key="top_producer",
+        value_fn=lambda fleet, plants: _plant_name(fleet.top_producers, plants),
+        attr_fn=lambda fleet, plants: {
+            "top_producers": _plant_list(fleet.top_producers, plants)
+        },
+    ),
+    HypontechFleetSensorDescription(
+        key="specific_yield_min",
+        translation_key="specific_yield_min",
+        native_unit_of_measurement="kWh/kW",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda fleet, _: fleet.specific_yield_min,
+    ),
+    HypontechFleetSensorDescription(
+        key="specific_yield_median",
+        translation_key="specific_yield_median",
+        native_unit_of_measurement="kWh/kW",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda fleet, _: fleet.specific_yield_median,
+    ),
+    HypontechFleetSensorDescription(
+        key="specific_yield_max",
+        translation_key="specific_yield_max",
+        native_unit_of_measurement="kWh/kW",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda fleet, _: fleet.specific_yield_max,
+    ),
+    HypontechFleetSensorDescription(
+        key="underperforming_plants",
+        translation_key="underperforming_plants",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet, _: len(fleet.underperformers),
+        attr_fn=lambda fleet, plants: {
+            "plants": _plant_list(fleet.underperformers, plants)
+        },
+    ),
+)
+
+DIAGNOSTIC_SENSORS: tuple[HypontechDiagnosticSensorDescription, ...] = (
+    HypontechDiagnosticSensorDescription(
+        key="circuit_breaker",
+        translation_key="circuit_breaker",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in BreakerState],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.breaker.state,
+    ),
+    HypontechDiagnosticSensorDescription(
+        key="skipped_updates",
+        translation_key="skipped_updates",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.skipped_updates,
+    ),
+)
+
+# Plants whose sensors are created and added at once.
+PLANT_ENTITY_CHUNK = 100
+
+# Cloud calls with request metrics, and how their sensors are named. The
+# overview call is not called "Overview", the name of the device they are on.
+METRIC_CALLS: dict[str, str] = {
+    "connect": "Login",
+    "get_overview": "Summary",
+    "get_list": "Plant list",
+}
+
+
+def _metric_sensors(
+    call: str, label: str
+) -> tuple[HypontechDiagnosticSensorDescription, ...]:
+    """Return the request metric sensor descriptions of a cloud call."""
+    placeholders = {"call": label}
+
+    def _latency(percent: int) -> HypontechDiagnosticSensorDescription:
+        return HypontechDiagnosticSensorDescription(
+            key=f"{call}_latency_p{percent}",
+            translation_key=f"latency_p{percent}",
+            translation_placeholders=placeholders,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda c: c.metrics.get(call).latency_percentile(percent),
+        )
+
+    return (
+        _latency(50),
+        _latency(95),
+        _latency(99),
+        HypontechDiagnosticSensorDescription(
+            key=f"{call}_successes",
+            translation_key="request_successes",
+            translation_placeholders=placeholders,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda c: c.metrics.get(call).successes,
+        ),
+        HypontechDiagnosticSensorDescription(
+            key=f"{call}_errors",
+            translation_key="request_errors",
+            translation_placeholders=placeholders,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda c: c.metrics.get(call).errors,
+        ),
+        HypontechDiagnosticSensorDescription(
+            key=f"{call}_response_size",
+            translation_key="response_size",
+            translation_placeholders=placeholders,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda c: c.metrics.get(call).response_size,
+        ),
+    )
+
+
+DIAGNOSTIC_SENSORS += tuple(
+    description
+    for call, label in METRIC_CALLS.items()
+    for description in _metric_sensors(call, label)
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: HypontechConfigEntry,
@@ -99,20 +340,74 @@ async def async_setup_entry(
     entities: list[SensorEntity] = [
         HypontechOverviewSensor(coordinator, desc) for desc in OVERVIEW_SENSORS
     ]
-
     entities.extend(
-        HypontechPlantSensor(coordinator, plant_id, desc)
-        for plant_id in coordinator.data.plants
-        for desc in PLANT_SENSORS
+        HypontechRollingSensor(coordinator, desc) for desc in ROLLING_SENSORS
+    )
+    entities.extend(HypontechFleetSensor(coordinator, desc) for desc in FLEET_SENSORS)
+    entities.extend(
+        HypontechDiagnosticSensor(coordinator, desc) for desc in DIAGNOSTIC_SENSORS
     )
 
     async_add_entities(entities)
 
+    async def _async_add_plants(plant_ids: Iterable[str]) -> None:
+        """Add the sensors of plants, a chunk at a time.
+
+        The device of a plant is built once and shared by its sensors, and
+        the event loop gets a turn between chunks, so large accounts do not
+        block it.
+        """
+        start = monotonic()
+        count = 0
+        for chunk in batched(plant_ids, PLANT_ENTITY_CHUNK, strict=False):
+            plants = coordinator.data.plants
+            new_entities: list[SensorEntity] = []
+            for plant_id in chunk:
+                if (slot := plants.slot(plant_id)) is None:
+                    # Removed again in the meantime.
+                    coordinator.plant_ids.discard(plant_id)
+                    continue
+                device = plant_device(plant_id, slot, plants.names[slot])
+                new_entities.extend(
+                    HypontechPlantSensor(coordinator, device, desc)
+                    for desc in PLANT_SENSORS
+                )
+                count += 1
+            async_add_entities(new_entities)
+            await asyncio.sleep(0)
+        LOGGER.debug(
+            "Created the sensors of %d plants in %.3fs", count, monotonic() - start
+        )
+
+    def _new_plant_ids() -> list[str]:
+        """Return the plants without sensors yet, and mark them as having some."""
+        new_plant_ids = [
+            plant_id
+            for plant_id in coordinator.data.plants
+            if plant_id not in coordinator.plant_ids
+        ]
+        coordinator.plant_ids.update(new_plant_ids)
+        return new_plant_ids
+
+    @callback
+    def _async_add_new_plants() -> None:
+        """Add the sensors of plants that joined the account."""
+        if new_plant_ids := _new_plant_ids():
+            config_entry.async_create_task(
+                hass, _async_add_plants(new_plant_ids), "hypontech add plants"
+            )
+
+    await _async_add_plants(_new_plant_ids())
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(_async_add_new_plants, PLANT_LIST_CONTEXT)
+    )
+
 
 class HypontechOverviewSensor(HypontechEntity, SensorEntity):
     """Class describing Hypontech overview sensor entities."""
 
     entity_description: HypontechSensorDescription
+    _data_part = DataPart.OVERVIEW
 
     def __init__(
         self,
@@ -130,6 +425,110 @@ class HypontechOverviewSensor(HypontechEntity, SensorEntity):
         return self.entity_description.value_fn(self.coordinator.data.overview)
 
 
+class HypontechRollingSensor(HypontechEntity, SensorEntity):
+    """Class describing Hypontech overview sensor entities over recent samples."""
+
+    entity_description: HypontechRollingSensorDescription
+    _data_part = DataPart.OVERVIEW
+
+    def __init__(
+        self,
+        coordinator: HypontechDataCoordinator,
+        description: HypontechRollingSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.overview_history)
+
+
+class HypontechFleetSensor(HypontechEntity, SensorEntity):
+    """Class describing Hypontech fleet sensor entities."""
+
+    entity_description: HypontechFleetSensorDescription
+    _data_part = DataPart.PLANTS
+    _unrecorded_attributes = frozenset({"top_producers", "plants"})
+
+    def __init__(
+        self,
+        coordinator: HypontechDataCoordinator,
+        description: HypontechFleetSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, FLEET_CONTEXT)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+
+    @property
+    def _fetched_at(self) -> datetime | None:
+        """Return when the plants were fetched, if they could not be refreshed."""
+        return self.coordinator.data.plants_fetched_at
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        data = self.coordinator.data
+        return self.entity_description.value_fn(data.fleet, data.plants)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the plants behind the state."""
+        attributes = super().extra_state_attributes
+        if self.entity_description.attr_fn is None:
+            return attributes
+        data = self.coordinator.data
+        return {
+            **(attributes or {}),
+            **self.entity_description.attr_fn(data.fleet, data.plants),
+        }
+
+
+class HypontechDiagnosticSensor(HypontechEntity, SensorEntity):
+    """Class describing Hypontech connection diagnostic sensor entities."""
+
+    entity_description: HypontechDiagnosticSensorDescription
+
+    def __init__(
+        self,
+        coordinator: HypontechDataCoordinator,
+        description: HypontechDiagnosticSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow every update, also the failed ones."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_diagnostics_listener(self.async_write_ha_state)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Leave the updates to the diagnostics listener."""
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available.
+
+        The sensor describes the connection itself, so it stays available
+        while the cloud does not answer.
+        """
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+
 class HypontechPlantSensor(HypontechPlantEntity, SensorEntity):
     """Class describing Hypontech plant sensor entities."""
 
@@ -138,17 +537,18 @@ class HypontechPlantSensor(HypontechPlantEntity, SensorEntity):
     def __init__(
         self,
         coordinator: HypontechDataCoordinator,
-        plant_id: str,
+        device: PlantDevice,
         description: HypontechPlantSensorDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, plant_id)
+        super().__init__(coordinator, device)
         self.entity_description = description
-        self._attr_unique_id = f"{plant_id}_{description.key}"
+        self._attr_unique_id = f"{device.plant_id}_{description.key}"
+        self._live_plant_power = description.live_power
 
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.plant is None:
+        if (slot := self.slot) is None:
             return None
-        return self.entity_description.value_fn(self.plant)
+        return self.entity_description.value_fn(self.coordinator.data.plants, slot)
@@ -0,0 +1,73 @@
+"""Services for the Hypontech Cloud integration."""
+
+from __future__ import annotations
+
+import asyncio
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, SERVICE_REFRESH
+from .coordinator import HypontechConfigEntry
+
+REFRESH_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _get_entries(call: ServiceCall) -> list[HypontechConfigEntry]:
+    """Return the loaded config entries a service call targets."""
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is None:
+        return call.hass.config_entries.async_loaded_entries(DOMAIN)
+    entry = call.hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"title": entry.title},
+        )
+    return [entry]
+
+
+async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+    """Refresh the data of one or all accounts."""
+    entries = _get_entries(call)
+    fetched = await asyncio.gather(
+        *(entry.runtime_data.async_refresh_on_demand() for entry in entries)
+    )
+    return {
+        "entries": {
+            entry.entry_id: {
+                "last_fetched": last_fetched.isoformat() if last_fetched else None,
+                "success": entry.runtime_data.last_update_success,
+            }
+            for entry, last_fetched in zip(entries, fetched, strict=True)
+        }
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,162 @@
+"""Shared and persisted Hypontech Cloud sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from time import time
+from typing import Any
+
+from hyponcloud import HyponCloud
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+from .metrics import create_trace_config
+
+DATA_SESSIONS: HassKey[HypontechSessionRegistry] = HassKey(f"{DOMAIN}_sessions")
+
+STORAGE_KEY = f"{DOMAIN}.sessions"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+def get_token(client: HyponCloud) -> tuple[str, int]:
+    """Return the token of a client.
+
+    The library keeps its token private and offers no way to restore it.
+    """
+    return client._HyponCloud__token, client._HyponCloud__token_expires_at  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+def set_token(client: HyponCloud, token: str, expires_at: int) -> None:
+    """Restore the token of a client."""
+    client._HyponCloud__token = token  # type: ignore[attr-defined]  # noqa: SLF001
+    client._HyponCloud__token_expires_at = expires_at  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+def needs_login(client: HyponCloud) -> bool:
+    """Return if the next request of a client logs in first."""
+    token, expires_at = get_token(client)
+    return not token or expires_at <= time()
+
+
+@dataclass
+class _Session:
+    """A client together with the credentials it was created for."""
+
+    password: str
+    client: HyponCloud
+    verified: bool
+
+
+class HypontechSessionRegistry:
+    """Keep one authenticated client per account and persist its token."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY, private=True
+        )
+        self._load_lock = asyncio.Lock()
+        self._tokens: dict[str, dict[str, Any]] | None = None
+        self._sessions: dict[str, _Session] = {}
+        # A dedicated HTTP session, so response sizes can be measured.
+        self.http_session = async_create_clientsession(
+            hass, trace_configs=[create_trace_config()]
+        )
+
+    async def _async_load(self) -> dict[str, dict[str, Any]]:
+        """Load the persisted tokens once."""
+        async with self._load_lock:
+            if self._tokens is None:
+                self._tokens = await self._store.async_load() or {}
+        return self._tokens
+
+    @callback
+    def _async_save_token(self, username: str, client: HyponCloud) -> None:
+        """Persist the token of a client if it changed."""
+        if self._tokens is None:
+            return
+        token, expires_at = get_token(client)
+        saved = {"token": token, "expires_at": expires_at}
+        if self._tokens.get(username) == saved:
+            return
+        if token:
+            self._tokens[username] = saved
+        else:
+            self._tokens.pop(username, None)
+        self._store.async_delay_save(lambda: self._tokens or {}, SAVE_DELAY)
+
+    @callback
+    def async_register(self, username: str, password: str, client: HyponCloud) -> None:
+        """Hand over a client that has just logged in, e.g. in the config flow."""
+        self._sessions[username] = _Session(password, client, verified=True)
+        self._async_save_token(username, client)
+
+    async def async_get_client(self, username: str, password: str) -> HyponCloud:
+        """Return the client of an account, with its saved token if still valid.
+
+        The client logs in by itself on its first request without a usable
+        token.
+        """
+        tokens = await self._async_load()
+        session = self._sessions.get(username)
+        if session is None or session.password != password:
+            client = HyponCloud(username, password, self.http_session)
+            verified = True
+            if (saved := tokens.get(username)) and saved["expires_at"] > time():
+                LOGGER.debug("Reusing saved Hypontech Cloud token for %s", username)
+                set_token(client, saved["token"], saved["expires_at"])
+                verified = False
+            session = self._sessions[username] = _Session(password, client, verified)
+        return session.client
+
+    @callback
+    def async_token_accepted(self, username: str) -> None:
+        """Record that the cloud accepted the token of the account."""
+        if (session := self._sessions.get(username)) is None:
+            return
+        session.verified = True
+        self._async_save_token(username, session.client)
+
+    @callback
+    def async_token_failed(self, username: str) -> None:
+        """Drop a restored token that the cloud has not accepted yet."""
+        if (session := self._sessions.get(username)) is None or session.verified:
+            return
+        LOGGER.debug("Saved Hypontech Cloud token for %s was rejected", username)
+        set_token(session.client, "", 0)
+        session.verified = True
+        self._async_save_token(username, session.client)
+
+    @callback
+    def async_token_rejected(self, username: str, token: str) -> None:
+        """Drop a token the cloud rejected, unless a new one replaced it."""
+        if (session := self._sessions.get(username)) is None or (
+            get_token(session.client)[0] != token
+        ):
+            return
+        LOGGER.debug("Hypontech Cloud rejected the token of %s", username)
+        set_token(session.client, "", 0)
+        session.verified = True
+        self._async_save_token(username, session.client)
+
+    async def async_forget(self, username: str) -> None:
+        """Forget the client and token of an account."""
+        tokens = await self._async_load()
+        self._sessions.pop(username, None)
+        if tokens.pop(username, None) is not None:
+            await self._store.async_save(tokens)
+
+
+@callback
+def async_get_session_registry(hass: HomeAssistant) -> HypontechSessionRegistry:
+    """Return the session registry."""
+    if (registry := hass.data.get(DATA_SESSIONS)) is None:
+        registry = hass.data[DATA_SESSIONS] = HypontechSessionRegistry(hass)
+    return registry
@@ -0,0 +1,106 @@
+"""Spread the cloud requests of all Hypontech Cloud accounts over time."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from time import monotonic
+
+from hyponcloud import HyponCloud
+
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGIN_SPACING, MAX_CONCURRENT_REQUESTS
+from .session import needs_login
+
+DATA_THROTTLE: HassKey[HypontechThrottle] = HassKey(f"{DOMAIN}_throttle")
+
+
+class HypontechThrottle:
+    """Keep the accounts of a Home Assistant instance from polling in bursts.
+
+    Every account gets a slot, and the slots are spread evenly over the
+    polling interval, so the updates of many accounts take turns instead of
+    all starting on the same second. On top of that, the number of cloud
+    calls running at once is capped, and logins at startup are spaced out.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the throttle."""
+        self.hass = hass
+        self._entry_ids: list[str] = []
+        self._requests = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._next_login = 0.0
+        self.in_flight = 0
+
+    @callback
+    def async_register(self, entry_id: str) -> CALLBACK_TYPE:
+        """Give an account a slot, returning a callback to release it."""
+        self._entry_ids.append(entry_id)
+
+        @callback
+        def unregister() -> None:
+            self._entry_ids.remove(entry_id)
+
+        return unregister
+
+    @callback
+    def async_slot(self, entry_id: str) -> tuple[int, int] | None:
+        """Return the slot of an account and the number of slots."""
+        if entry_id not in self._entry_ids:
+            return None
+        return self._entry_ids.index(entry_id), len(self._entry_ids)
+
+    @callback
+    def async_stagger(
+        self, entry_id: str, now: datetime, delay: timedelta
+    ) -> timedelta:
+        """Move the next update of an account to its slot.
+
+        The update moves by at most half the delay either way, so updates
+        keep coming at the same rate once they are in their slots.
+        """
+        if (slot := self.async_slot(entry_id)) is None or slot[1] < 2:
+            return delay
+        seconds = delay.total_seconds()
+        if seconds <= 0:
+            return delay
+        index, count = slot
+        earliest = now.timestamp() + seconds / 2
+        due = earliest + (index * seconds / count - earliest) % seconds
+        return timedelta(seconds=due - now.timestamp())
+
+    @asynccontextmanager
+    async def async_request(self) -> AsyncIterator[float]:
+        """Wait for a free request slot, giving the time waited."""
+        start = monotonic()
+        async with self._requests:
+            self.in_flight += 1
+            try:
+                yield monotonic() - start
+            finally:
+                self.in_flight -= 1
+
+    async def async_wait_login(self, client: HyponCloud) -> None:
+        """Wait before a login while Home Assistant starts.
+
+        Requests reusing a valid token go right away.
+        """
+        if self.hass.state is CoreState.running or not needs_login(client):
+            return
+        now = self.hass.loop.time()
+        turn = max(now, self._next_login)
+        self._next_login = turn + LOGIN_SPACING
+        if turn > now:
+            await asyncio.sleep(turn - now)
+
+
+@callback
+def async_get_throttle(hass: HomeAssistant) -> HypontechThrottle:
+    """Return the throttle shared by all accounts."""
+    if (throttle := hass.data.get(DATA_THROTTLE)) is None:
+        throttle = hass.data[DATA_THROTTLE] = HypontechThrottle(hass)
+    return throttle
@@ -0,0 +1,204 @@
+"""Benchmark harness for the Hypontech Cloud setup and update hot paths."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from statistics import median
+from time import process_time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from hyponcloud import OverviewData, PlantData
+
+from homeassistant.components.hypontech.api import PlantPage
+from homeassistant.components.hypontech.const import (
+    PLANT_LIST_INTERVAL,
+    PLANT_PAGE_SIZE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+
+from tests.common import MockConfigEntry
+
+# Allowed growth of the allocations over the baseline before it counts as a
+# regression. State writes are exact and must not grow at all.
+ALLOCATION_TOLERANCE = 0.25
+# Growth of the timings over the baseline worth a warning. Timings are noisy
+# even once calibrated, between runs and machines, so they never fail.
+TIME_TOLERANCE = 1.0
+
+
+def calibrate() -> float:
+    """Return the CPU time of a fixed workload, the unit of the timings.
+
+    Timings expressed in this unit can be compared between machines.
+    """
+    best = float("inf")
+    for _ in range(5):
+        start = process_time()
+        sum(number * number for number in range(200_000))
+        best = min(best, process_time() - start)
+    return best
+
+
+@dataclass
+class BenchmarkResult:
+    """Cost of setting up and updating an account with many plants."""
+
+    setup_time: float
+    update_time: float
+    update_allocated: int
+    setup_state_writes: int
+    update_state_writes: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result in its baseline form."""
+        return asdict(self)
+
+    def _beyond(self, limits: Mapping[str, float]) -> list[str]:
+        """Return the figures above their limits."""
+        return [
+            f"{name}: {getattr(self, name)} > {limit}"
+            for name, limit in limits.items()
+            if getattr(self, name) > limit
+        ]
+
+    def regressions(self, baseline: Mapping[str, Any]) -> list[str]:
+        """Return the deterministic figures that grew over a baseline."""
+        return self._beyond(
+            {
+                "update_allocated": baseline["update_allocated"]
+                * (1 + ALLOCATION_TOLERANCE),
+                "setup_state_writes": baseline["setup_state_writes"],
+                "update_state_writes": baseline["update_state_writes"],
+            }
+        )
+
+    def slowdowns(self, baseline: Mapping[str, Any]) -> list[str]:
+        """Return the timings that grew well over a baseline."""
+        return self._beyond(
+            {
+                "setup_time": baseline["setup_time"] * (1 + TIME_TOLERANCE),
+                "update_time": baseline["update_time"] * (1 + TIME_TOLERANCE),
+            }
+        )
+
+
+class SyntheticCloud:
+    """Answer the coordinator's calls with generated plants."""
+
+    def __init__(self, plant_count: int) -> None:
+        """Initialize the synthetic cloud."""
+        self.plant_count = plant_count
+        self.cycle = 0
+        self._pages: list[list[PlantData]] = []
+        self.next_cycle()
+
+    def next_cycle(self) -> None:
+        """Let the power of every plant change, ahead of the next update.
+
+        The pages are built here so building them is not measured.
+        """
+        self.cycle += 1
+        plants = [
+            PlantData(
+                plant_id=str(1_000_000 + index),
+                plant_name=f"Plant {index}",
+                power=(index * 7 + self.cycle * 13) % 5000,
+                e_today=self.cycle / 10,
+                e_total=1000 + index + self.cycle / 10,
+            )
+            for index in range(self.plant_count)
+        ]
+        self._pages = [
+            plants[start : start + PLANT_PAGE_SIZE]
+            for start in range(0, self.plant_count, PLANT_PAGE_SIZE)
+        ] or [[]]
+
+    async def get_overview(self, retries: int = 3) -> OverviewData:
+        """Return the overview."""
+        return OverviewData(power=self.cycle * 100, e_today=self.cycle / 10)
+
+    async def get_plant_page(self, *args: Any) -> PlantPage:
+        """Return a page of the plant list."""
+        page = args[2]
+        return PlantPage(self._pages[page - 1], page_count=len(self._pages))
+
+
+async def async_run_benchmark(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry: MockConfigEntry,
+    plant_count: int,
+    cycles: int = 5,
+) -> BenchmarkResult:
+    """Set up an account with synthetic plants and update it a few times.
+
+    Every update fetches the plant list with new figures for every plant,
+    the most expensive update there is. The update time is the median of
+    the cycles, to shed the odd slow one. Allocations are traced in a cycle
+    of their own, as tracing slows down the timed ones.
+    """
+    cloud = SyntheticCloud(plant_count)
+    unit = calibrate()
+    writes = 0
+    write_ha_state = Entity.async_write_ha_state
+
+    def _counting_write_ha_state(entity: Entity) -> None:
+        nonlocal writes
+        writes += 1
+        write_ha_state(entity)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            side_effect=cloud.get_overview,
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            side_effect=cloud.get_plant_page,
+        ),
+        patch.object(Entity, "async_write_ha_state", _counting_write_ha_state),
+    ):
+        entry.add_to_hass(hass)
+        start = process_time()
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_time = process_time() - start
+        setup_state_writes = writes
+        coordinator = entry.runtime_data
+
+        update_times: list[float] = []
+        for _ in range(cycles):
+            cloud.next_cycle()
+            freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+            writes = 0
+            start = process_time()
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            update_times.append(process_time() - start)
+        update_state_writes = writes
+
+        cloud.next_cycle()
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        tracemalloc.start()
+        try:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            update_allocated = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert coordinator.last_update_success
+    return BenchmarkResult(
+        setup_time=round(setup_time / unit, 1),
+        update_time=round(median(update_times) / unit, 2),
+        update_allocated=update_allocated,
+        setup_state_writes=setup_state_writes,
+        update_state_writes=update_state_writes,
+    )
@@ -1,17 +1,30 @@
 """Common fixtures for the Hypontech Cloud tests."""
 
-from collections.abc import Callable, Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
+from hyponcloud import HyponCloud, OverviewData
 import pytest
 
+from homeassistant.components.hypontech.api import PlantPage
 from homeassistant.components.hypontech.const import DOMAIN
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
+from .emulator import HyponCloudEmulator, HyponCloudEmulatorConfig
+
 from tests.common import MockConfigEntry
 
 
+@pytest.fixture(autouse=True)
+def no_retry_delay() -> Generator[None]:
+    """Skip the pauses between retries of a cloud call."""
+    with patch("homeassistant.components.hypontech.coordinator.RETRY_MAX_DELAY", 0):
+        yield
+
+
 @pytest.fixture
 def mock_setup_entry() -> Generator[AsyncMock]:
     """Override async_setup_entry."""
@@ -63,22 +76,56 @@ def mock_hyponcloud() -> Generator[AsyncMock]:
     """Mock HyponCloud."""
     with (
         patch(
-            "homeassistant.components.hypontech.HyponCloud.connect",
+            "homeassistant.components.hypontech.session.HyponCloud.connect",
             return_value=True,
         ),
         patch(
-            "homeassistant.components.hypontech.HyponCloud.get_admin_info",
+            "homeassistant.components.hypontech.session.HyponCloud.get_admin_info",
         ) as mock_get_admin_info,
         patch(
             "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
         ) as mock_get_overview,
         patch(
-            "homeassistant.components.hypontech.coordinator.HyponCloud.get_list",
-        ) as mock_get_list,
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+        ) as mock_get_plant_page,
     ):
         mock_admin_info = AsyncMock()
         mock_admin_info.id = "mock_account_id_123"
         mock_get_admin_info.return_value = mock_admin_info
-        mock_get_overview.return_value = AsyncMock()
-        mock_get_list.return_value = []
+        mock_get_overview.return_value = OverviewData()
+        mock_get_plant_page.return_value = PlantPage([])
         yield mock_get_overview
+
+
+@pytest.fixture
+def emulator_config() -> HyponCloudEmulatorConfig:
+    """Return the behaviour of the emulated cloud."""
+    return HyponCloudEmulatorConfig()
+
+
+@pytest.fixture
+async def hypon_cloud_emulator(
+    socket_enabled: None,
+    emulator_config: HyponCloudEmulatorConfig,
+) -> AsyncGenerator[HyponCloudEmulator]:
+    """Serve an emulated Hypon Cloud on localhost and point the integration at it."""
+    emulator = HyponCloudEmulator(emulator_config)
+    base_url = await emulator.async_start()
+
+    class EmulatedHyponCloud(HyponCloud):
+        """HyponCloud talking to the emulator."""
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.base_url = base_url
+
+    with (
+        patch(
+            "homeassistant.components.hypontech.session.HyponCloud",
+            EmulatedHyponCloud,
+        ),
+        # Skip the 10 s pauses between the library's own retries.
+        patch("hyponcloud.client.asyncio", SimpleNamespace(sleep=AsyncMock())),
+    ):
+        yield emulator
+    await emulator.async_stop()
@@ -0,0 +1,162 @@
+"""Local stand-in for the Hypon Cloud API used by the Hypontech Cloud tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+import math
+import random
+import secrets
+from time import sleep, time
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+USERNAME = "test@example.com"
+PASSWORD = "test-password"
+
+
+@dataclass
+class HyponCloudEmulatorConfig:
+    """Behaviour of the emulated cloud."""
+
+    plant_count: int = 10
+    # Response latency follows a log-normal distribution around the median.
+    latency_median: float = 0.005
+    latency_sigma: float = 0.5
+    # Probability that a request starts a burst of HTTP 500 responses.
+    error_rate: float = 0.0
+    error_burst: int = 1
+    # Seconds before the cloud rejects a token it handed out.
+    token_validity: int = 3600
+    seed: int = 0
+
+
+class HyponCloudEmulator:
+    """aiohttp application answering like the Hypon Cloud v2 API."""
+
+    def __init__(self, config: HyponCloudEmulatorConfig | None = None) -> None:
+        """Initialize the emulator."""
+        self.config = config or HyponCloudEmulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.latencies: list[float] = []
+        self.response_bytes = 0
+        self._tokens: dict[str, float] = {}
+        self._burst_left = 0
+        self._capacities = [
+            round(self.random.uniform(3, 50), 1) for _ in range(self.config.plant_count)
+        ]
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post("/v2/login", self._login)
+        self.app.router.add_get("/v2/plant/overview", self._overview)
+        self.app.router.add_get("/v2/plant/list2", self._plant_list)
+        self.app.router.add_get("/v2/administrator/admininfo", self._admin_info)
+        self.server: TestServer | None = None
+
+    async def async_start(self) -> str:
+        """Start serving on localhost and return the API base URL."""
+        self.server = TestServer(self.app)
+        # No access log, its records would pile up in the captured logs.
+        await self.server.start_server(access_log=None)
+        return str(self.server.make_url("/v2"))
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self.server is not None:
+            await self.server.close()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.Response:
+        """Apply latency, fault injection and token checks to every request."""
+        name = request.path.removeprefix("/v2/")
+        self.requests[name] += 1
+        latency = self.random.lognormvariate(
+            math.log(self.config.latency_median), self.config.latency_sigma
+        )
+        self.latencies.append(latency)
+        # Wait outside the event loop, its clock stands still under freezer.
+        await asyncio.to_thread(sleep, latency)
+
+        if self._burst_left == 0 and self.random.random() < self.config.error_rate:
+            self._burst_left = self.config.error_burst
+        if self._burst_left:
+            self._burst_left -= 1
+            self.errors[name] += 1
+            return web.json_response({"message": "internal error"}, status=500)
+
+        if name != "login":
+            token = request.headers.get("authorization", "").removeprefix("Bearer ")
+            if self._tokens.get(token, 0) <= time():
+                self.errors[name] += 1
+                return web.json_response({"message": "unauthorized"}, status=401)
+
+        response = await handler(request)
+        self.response_bytes += len(response.body)
+        return response
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Hand out a token for valid credentials."""
+        body = await request.json()
+        if body.get("username") != USERNAME or body.get("password") != PASSWORD:
+            return web.json_response({"message": "invalid credentials"}, status=401)
+        token = secrets.token_hex(16)
+        self._tokens[token] = time() + self.config.token_validity
+        return web.json_response({"data": {"token": token}})
+
+    def _plant(self, index: int) -> dict[str, Any]:
+        """Return the current data of a plant, following the sun over the day."""
+        capacity = self._capacities[index]
+        hour = (time() % 86400) / 3600
+        daylight = max(0.0, math.sin(math.pi * (hour - 6) / 12))
+        # Energy is the integral of the power curve since sunrise at 6:00.
+        elapsed = min(max(hour - 6, 0), 12)
+        produced = capacity * 12 / math.pi * (1 - math.cos(math.pi * elapsed / 12))
+        return {
+            "plant_id": str(100000 + index),
+            "plant_name": f"Plant {index}",
+            "city": "Hanoi",
+            "country": "Vietnam",
+            "power": round(capacity * 1000 * daylight),
+            "e_today": round(produced, 1),
+            "e_total": round(capacity * 1000 + produced, 1),
+            "status": "online" if daylight else "offline",
+        }
+
+    async def _overview(self, request: web.Request) -> web.Response:
+        """Return the account overview."""
+        plants = [self._plant(index) for index in range(self.config.plant_count)]
+        return web.json_response(
+            {
+                "data": {
+                    "capacity": round(sum(self._capacities), 1),
+                    "power": sum(plant["power"] for plant in plants),
+                    "e_today": round(sum(plant["e_today"] for plant in plants), 1),
+                    "e_total": round(sum(plant["e_total"] for plant in plants), 1),
+                    "normal_dev_num": self.config.plant_count,
+                }
+            }
+        )
+
+    async def _plant_list(self, request: web.Request) -> web.Response:
+        """Return one page of the plant list."""
+        page = int(request.query.get("page", 1))
+        page_size = int(request.query.get("page_size", 10))
+        start = (page - 1) * page_size
+        end = min(start + page_size, self.config.plant_count)
+        return web.json_response(
+            {
+                "data": [self._plant(index) for index in range(start, end)],
+                "total": self.config.plant_count,
+                "totalPage": math.ceil(self.config.plant_count / page_size),
+            }
+        )
+
+    async def _admin_info(self, request: web.Request) -> web.Response:
+        """Return the account information."""
+        return web.json_response(
+            {"data": {"id": "mock_account_id_123", "info": {"username": USERNAME}}}
+        )
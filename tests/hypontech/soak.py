@@ -0,0 +1,118 @@
+"""Soak harness driving the Hypontech Cloud coordinator over simulated time."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from statistics import fmean, quantiles
+from time import monotonic
+import tracemalloc
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.hypontech.coordinator import HypontechDataCoordinator
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run."""
+
+    cycles: int = 0
+    failed_cycles: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    state_writes: list[int] = field(default_factory=list, repr=False)
+    memory_growth: int = 0
+
+    def _percentile(self, percent: int) -> float:
+        """Return a percentile of the update latency in seconds."""
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return quantiles(self.latencies, n=100)[percent - 1]
+
+    @property
+    def latency_p50(self) -> float:
+        """Return the median update latency."""
+        return self._percentile(50)
+
+    @property
+    def latency_p95(self) -> float:
+        """Return the 95th percentile update latency."""
+        return self._percentile(95)
+
+    @property
+    def latency_p99(self) -> float:
+        """Return the 99th percentile update latency."""
+        return self._percentile(99)
+
+    @property
+    def mean_state_writes(self) -> float:
+        """Return the average number of state writes per cycle."""
+        return fmean(self.state_writes) if self.state_writes else 0.0
+
+    def summary(self) -> str:
+        """Return a one-line summary of the run."""
+        return (
+            f"{self.cycles} cycles ({self.failed_cycles} failed), latency "
+            f"p50={self.latency_p50 * 1000:.1f}ms p95={self.latency_p95 * 1000:.1f}ms "
+            f"p99={self.latency_p99 * 1000:.1f}ms, state writes/cycle "
+            f"mean={self.mean_state_writes:.1f} max={max(self.state_writes, default=0)}, "
+            f"memory growth={self.memory_growth / 1024:.1f}KiB"
+        )
+
+
+async def async_run_soak(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    coordinator: HypontechDataCoordinator,
+    duration: timedelta,
+    warmup: timedelta = timedelta(hours=1),
+) -> SoakReport:
+    """Let the coordinator poll on its own schedule for a simulated duration.
+
+    Memory growth is measured from the end of the warmup, so caches, rolling
+    windows and the saved snapshot that fill once do not count.
+    """
+    report = SoakReport()
+    writes = 0
+    write_ha_state = Entity.async_write_ha_state
+
+    def _counting_write_ha_state(entity: Entity) -> None:
+        nonlocal writes
+        writes += 1
+        write_ha_state(entity)
+
+    warmed_up = dt_util.utcnow() + warmup
+    end = warmed_up + duration
+    baseline: int | None = None
+    tracemalloc.start()
+    try:
+        with patch.object(Entity, "async_write_ha_state", _counting_write_ha_state):
+            while dt_util.utcnow() < end:
+                assert coordinator.update_interval is not None
+                freezer.tick(coordinator.update_interval)
+                writes = 0
+                start = monotonic()
+                async_fire_time_changed(hass)
+                await hass.async_block_till_done(wait_background_tasks=True)
+                report.latencies.append(monotonic() - start)
+                report.state_writes.append(writes)
+                report.cycles += 1
+                # The test storage keeps every write in its calls, they are
+                # not the integration's memory.
+                Store._async_write_data.reset_mock()  # noqa: SLF001
+                if not coordinator.last_update_success:
+                    report.failed_cycles += 1
+                if baseline is None and dt_util.utcnow() >= warmed_up:
+                    baseline = tracemalloc.get_traced_memory()[0]
+        assert baseline is not None
+        report.memory_growth = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return report
@@ -0,0 +1,59 @@
+"""Benchmarks of the Hypontech Cloud setup and update hot paths."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from .benchmark import async_run_benchmark
+
+from tests.common import MockConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+# Record the results as the new baseline instead of comparing them.
+UPDATE_BASELINE = bool(os.environ.get("HYPONTECH_BENCHMARK_UPDATE"))
+
+# Setting up 10000 plants takes a while, the benchmark only runs when asked.
+pytestmark = pytest.mark.skipif(
+    not (os.environ.get("HYPONTECH_BENCHMARK") or UPDATE_BASELINE),
+    reason="Set HYPONTECH_BENCHMARK to run the benchmark",
+)
+
+
+@pytest.mark.parametrize("plant_count", [1, 100, 1000, 10000])
+async def test_benchmark(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    plant_count: int,
+) -> None:
+    """Test setup and updates do not regress against the baseline.
+
+    Allocations and state writes fail the test, timings only warn.
+    """
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    expected = baseline["results"].get(str(plant_count))
+    if expected is None and not UPDATE_BASELINE:
+        pytest.skip(f"No baseline for {plant_count} plants")
+
+    freezer.move_to("2026-06-21 12:00:00+00:00")
+    result = await async_run_benchmark(hass, freezer, mock_config_entry, plant_count)
+    _LOGGER.info("%d plants: %s", plant_count, result)
+
+    if UPDATE_BASELINE:
+        baseline["results"][str(plant_count)] = result.as_dict()
+        BASELINE.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return
+    if slowdowns := result.slowdowns(expected):
+        _LOGGER.warning("%d plants slowed down: %s", plant_count, slowdowns)
+    assert result.regressions(expected) == []
@@ -5,7 +5,17 @@ from unittest.mock import AsyncMock, patch
 from hyponcloud import AuthenticationError
 import pytest
 
-from homeassistant.components.hypontech.const import DOMAIN
+from homeassistant.components.hypontech.const import (
+    CONF_EXCLUDE_NAMES,
+    CONF_EXCLUDE_PLANTS,
+    CONF_INCLUDE_PLANTS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_REFRESH_SPACING,
+    CONF_RULE_ID,
+    CONF_RULES,
+    DOMAIN,
+)
 from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
@@ -255,3 +265,115 @@ async def test_reauth_flow_wrong_account(hass: HomeAssistant, create_entry) -> N
 
     assert result["type"] is FlowResultType.ABORT
     assert result["reason"] == "wrong_account"
+
+
+async def test_options_flow(hass: HomeAssistant, create_entry) -> None:
+    """Test configuring the polling intervals."""
+    entry = create_entry()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.MENU
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "intervals"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "intervals"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_MIN_INTERVAL: 600, CONF_MAX_INTERVAL: 300},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "min_above_max"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_MIN_INTERVAL: 120, CONF_MAX_INTERVAL: 1800},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_MIN_INTERVAL: 120,
+        CONF_MAX_INTERVAL: 1800,
+        CONF_REFRESH_SPACING: 10,
+    }
+
+
+async def test_options_flow_plants(hass: HomeAssistant, create_entry) -> None:
+    """Test selecting the plants that get entities."""
+    entry = create_entry()
+    hass.config_entries.async_update_entry(entry, options={CONF_MIN_INTERVAL: 120})
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "plants"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "plants"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_EXCLUDE_PLANTS: ["2"], CONF_EXCLUDE_NAMES: ["Test*"]},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_MIN_INTERVAL: 120,
+        CONF_INCLUDE_PLANTS: [],
+        CONF_EXCLUDE_PLANTS: ["2"],
+        CONF_EXCLUDE_NAMES: ["Test*"],
+    }
+    assert entry.data == {
+        CONF_USERNAME: "test@example.com",
+        CONF_PASSWORD: "test-password",
+    }
+
+
+async def test_options_flow_rules(hass: HomeAssistant, create_entry) -> None:
+    """Test adding and removing threshold rules."""
+    entry = create_entry()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["menu_options"] == ["intervals", "plants", "add_rule"]
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "add_rule"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "add_rule"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {"name": "No production", "threshold": 10, "daylight_only": True},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    rule_id = entry.options[CONF_RULES][0][CONF_RULE_ID]
+    assert entry.options == {
+        CONF_RULES: [
+            {
+                CONF_RULE_ID: rule_id,
+                "name": "No production",
+                "target": "overview",
+                "metric": "power",
+                "condition": "below",
+                "threshold": 10,
+                "hysteresis": 0,
+                "daylight_only": True,
+            }
+        ]
+    }
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["menu_options"] == [
+        "intervals",
+        "plants",
+        "add_rule",
+        "remove_rules",
+    ]
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "remove_rules"}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_RULES: [rule_id]}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_RULES: []}
@@ -0,0 +1,908 @@
+"""Test the Hypontech Cloud coordinator."""
+
+import asyncio
+from datetime import timedelta
+from statistics import mean
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from hyponcloud import OverviewData, PlantData, RateLimitError, RequestError
+import pytest
+
+from homeassistant.components.hypontech.api import PlantPage
+from homeassistant.components.hypontech.const import (
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_DELAY,
+    CONF_EXCLUDE_NAMES,
+    CONF_EXCLUDE_PLANTS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    DOMAIN,
+    PLANT_LIST_INTERVAL,
+    PLANT_PAGE_SIZE,
+    PLANT_REMOVAL_GRACE,
+)
+from homeassistant.components.hypontech.coordinator import DataPart
+from homeassistant.components.hypontech.retry import BreakerState
+from homeassistant.components.hypontech.scheduler import (
+    CADENCE_MARGIN,
+    HypontechPollingScheduler,
+)
+from homeassistant.components.hypontech.sensor import (
+    OVERVIEW_SENSORS,
+    PLANT_ENTITY_CHUNK,
+    PLANT_SENSORS,
+    ROLLING_SENSORS,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .emulator import HyponCloudEmulator, HyponCloudEmulatorConfig
+
+from tests.common import MockConfigEntry
+
+
+def _disable_entities(
+    entity_registry: er.EntityRegistry, entry: MockConfigEntry, unique_ids: set[str]
+) -> None:
+    """Disable the entities of an entry with the given unique IDs."""
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if entity.unique_id in unique_ids and not entity.disabled:
+            entity_registry.async_update_entity(
+                entity.entity_id, disabled_by=er.RegistryEntryDisabler.USER
+            )
+
+
+def _plant_power_ids(plant_id: str) -> set[str]:
+    """Return the unique IDs of the sensors showing the power of a plant."""
+    return {f"{plant_id}_pv_power"}
+
+
+async def test_update_fetches_concurrently(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test overview and plant list are requested at the same time."""
+    mock_config_entry.add_to_hass(hass)
+    both_started = asyncio.Event()
+    started: list[str] = []
+
+    async def _fetch(name: str, result):
+        started.append(name)
+        if len(started) == 2:
+            both_started.set()
+        await both_started.wait()
+        return result
+
+    async def _get_overview(retries: int = 3) -> OverviewData:
+        return await _fetch("get_overview", OverviewData(power=100))
+
+    async def _get_plant_page(*args) -> PlantPage:
+        return await _fetch("get_list", PlantPage([PlantData(plant_id="1")]))
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            side_effect=_get_overview,
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            side_effect=_get_plant_page,
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.data.overview.power == 100
+    assert list(coordinator.data.plants) == ["1"]
+    assert set(coordinator.fetch_durations) == {"connect", "get_overview", "get_list"}
+
+
+async def test_update_failure_cancels_sibling(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test a failing call cancels the other in-flight call."""
+    mock_config_entry.add_to_hass(hass)
+    cancelled = asyncio.Event()
+
+    async def _slow_overview(retries: int = 3) -> OverviewData:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return OverviewData()
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            side_effect=_slow_overview,
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            side_effect=RequestError,
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert cancelled.is_set()
+
+
+async def test_update_call_timeout(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test a call exceeding its timeout fails the update."""
+    mock_config_entry.add_to_hass(hass)
+
+    async def _hanging_overview(retries: int = 3) -> OverviewData:
+        await asyncio.sleep(3600)
+        return OverviewData()
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch("homeassistant.components.hypontech.coordinator.REQUEST_TIMEOUT", 0),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            side_effect=_hanging_overview,
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage([]),
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.parametrize(
+    ("now", "power", "expected"),
+    [
+        # Midday, production expected.
+        ("2026-06-21 12:00:00+00:00", 0, timedelta(seconds=60)),
+        # Night with nothing produced, capped by the night interval.
+        ("2026-06-21 00:00:00+00:00", 0, timedelta(seconds=900)),
+        # Night but the plants still report power.
+        ("2026-06-21 00:00:00+00:00", 50, timedelta(seconds=60)),
+    ],
+)
+async def test_adaptive_interval(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    now: str,
+    power: int,
+    expected: timedelta,
+) -> None:
+    """Test the polling interval follows the sun and the production."""
+    await hass.config.async_update(latitude=51.48, longitude=0.0, elevation=0)
+    mock_config_entry.add_to_hass(hass)
+    scheduler = HypontechPollingScheduler(hass, mock_config_entry)
+
+    scheduler.async_record_power(power)
+
+    assert scheduler.async_next_interval(dt_util.parse_datetime(now)) == expected
+
+
+async def test_adaptive_interval_options(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test the interval bounds come from the options."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_MIN_INTERVAL: 120, CONF_MAX_INTERVAL: 1800},
+    )
+    scheduler = HypontechPollingScheduler(hass, mock_config_entry)
+
+    scheduler.async_record_power(100)
+
+    assert scheduler.async_next_interval() == timedelta(seconds=120)
+
+
+async def test_adaptive_interval_wakes_at_sunrise(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test the night interval is shortened to end at sunrise."""
+    await hass.config.async_update(latitude=51.48, longitude=0.0, elevation=0)
+    mock_config_entry.add_to_hass(hass)
+    scheduler = HypontechPollingScheduler(hass, mock_config_entry)
+
+    # Sunrise is at 03:43 UTC at this place and date.
+    interval = scheduler.async_next_interval(
+        dt_util.parse_datetime("2026-06-21 03:40:00+00:00")
+    )
+
+    assert timedelta(minutes=3) < interval < timedelta(minutes=4)
+
+
+@pytest.mark.parametrize("drift", [0.0, 1.5, -1.5, 10.0, -20.0])
+async def test_adaptive_interval_follows_cloud_cadence(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, drift: float
+) -> None:
+    """Test polls line up with the refreshes of the cloud, even drifting."""
+    await hass.config.async_update(latitude=51.48, longitude=0.0, elevation=0)
+    mock_config_entry.add_to_hass(hass)
+    scheduler = HypontechPollingScheduler(hass, mock_config_entry)
+    start = dt_util.parse_datetime("2026-06-21 10:00:00+00:00")
+    # The cloud refreshes every 5 minutes, a bit later or earlier each time.
+    refreshes = [37 + index * (300 + drift) for index in range(60)]
+
+    now = previous = 0.0
+    polls = 0
+    delays: list[float] = []
+    intervals: list[float] = []
+    while now < 4 * 3600:
+        refreshed = [time for time in refreshes if previous < time <= now]
+        if refreshed and polls:
+            delays.append(now - refreshed[-1])
+        scheduler.async_record_poll(
+            start + timedelta(seconds=now), bool(refreshed) and polls > 0
+        )
+        polls += 1
+        previous = now
+        intervals.append(
+            scheduler.async_next_interval(
+                start + timedelta(seconds=now)
+            ).total_seconds()
+        )
+        now += intervals[-1]
+
+    assert scheduler.cadence.period == pytest.approx(300 + drift, abs=1)
+    # Lining up never polls more often than the minimum interval.
+    assert min(intervals) >= 60
+    # Far fewer polls than every minute.
+    assert polls < 4 * 60 / 2
+    assert len(delays) >= 4 * 60 / 5 - 1
+    # Once the phase is narrowed down, a refresh is seen well sooner than
+    # the half minute it takes on average when polling every minute. A poll
+    # staggered before the refresh still waits the minimum interval.
+    settled = delays[len(delays) // 4 :]
+    assert mean(settled) < 15
+    assert max(settled) <= 60 + CADENCE_MARGIN
+
+
+async def test_update_only_changed_plants(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test only entities of changed plants are notified."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [
+                    PlantData(plant_id="1", power=40),
+                    PlantData(plant_id="2", power=60),
+                ]
+            ),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        assert coordinator.suppressed_updates == 0
+        # A second reading settles the rolling figures of the overview.
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        await coordinator.async_refresh()
+        suppressed_updates = coordinator.suppressed_updates
+
+        mock_get_plant_page.return_value = PlantPage(
+            [
+                PlantData(plant_id="1", power=50),
+                PlantData(plant_id="2", power=60),
+            ]
+        )
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        with patch(
+            "homeassistant.components.hypontech.sensor.HypontechPlantSensor.async_write_ha_state"
+        ) as mock_write:
+            await coordinator.async_refresh()
+
+    # Only the three sensors of plant 1 are updated.
+    assert len(mock_write.mock_calls) == 3
+    assert coordinator.suppressed_updates - suppressed_updates == 18
+
+
+async def test_unchanged_update_skipped(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test an update with unchanged payloads is not parsed nor dispatched."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [PlantData(plant_id="1", power=40)], fingerprint="abc"
+            ),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        mock_get_plant_page.return_value = PlantPage(None, fingerprint="abc")
+        # A second reading settles the rolling figures of the overview.
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        await coordinator.async_refresh()
+        data = coordinator.data
+        suppressed_updates = coordinator.suppressed_updates
+
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        with patch(
+            "homeassistant.components.hypontech.sensor.HypontechPlantSensor.async_write_ha_state"
+        ) as mock_write:
+            await coordinator.async_refresh()
+
+    # The last fingerprint was sent along.
+    assert mock_get_plant_page.mock_calls[-1].args[3] == "abc"
+    assert coordinator.skipped_updates == 1
+    assert coordinator.suppressed_updates == suppressed_updates
+    assert coordinator.data is data
+    assert coordinator.data.plants.get("1").power == 40
+    mock_write.assert_not_called()
+
+
+async def test_plant_list_fetched_less_often(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the plant list has its own cadence and error handling.
+
+    Nothing shows the power of the plants, which would keep the list live.
+    """
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ) as mock_get_overview,
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage([PlantData(plant_id="1", power=40)]),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        _disable_entities(
+            entity_registry,
+            mock_config_entry,
+            _plant_power_ids("1"),
+        )
+        await hass.async_block_till_done()
+        mock_get_plant_page.reset_mock()
+
+        # The overview is updated on its own between plant list fetches.
+        mock_get_overview.return_value = OverviewData(power=200)
+        await coordinator.async_refresh()
+        mock_get_plant_page.assert_not_called()
+        assert coordinator.data.overview.power == 200
+
+        # A failing plant list keeps the last plants, flagged with their age.
+        fetched_at = dt_util.utcnow()
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        mock_get_plant_page.side_effect = RequestError
+        mock_get_overview.return_value = OverviewData(power=300)
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data.overview.power == 300
+        assert coordinator.data.plants.get("1").power == 40
+        assert coordinator.data.plants_fetched_at == fetched_at
+        assert coordinator.data.overview_fetched_at is None
+
+        # And is retried on the next update.
+        mock_get_plant_page.reset_mock()
+        mock_get_plant_page.side_effect = None
+        mock_get_plant_page.return_value = PlantPage(
+            [PlantData(plant_id="1", power=50)]
+        )
+        await coordinator.async_refresh()
+        mock_get_plant_page.assert_called_once()
+        assert coordinator.data.plants.get("1").power == 50
+        assert coordinator.data.plants_fetched_at is None
+
+
+async def test_plant_list_live_while_power_shown(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the plant list is fetched on every update while power is shown."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [PlantData(plant_id="1", plant_name="Roof", power=40)]
+            ),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+
+        mock_get_plant_page.reset_mock()
+        mock_get_plant_page.return_value = PlantPage(
+            [PlantData(plant_id="1", plant_name="Roof", power=50)]
+        )
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        mock_get_plant_page.assert_called_once()
+        assert hass.states.get("sensor.roof_power").state == "50"
+
+        # Once no plant shows its power, the list waits for its interval,
+        # the fleet sensors follow it at that pace.
+        _disable_entities(
+            entity_registry,
+            mock_config_entry,
+            _plant_power_ids("1"),
+        )
+        await hass.async_block_till_done()
+        mock_get_plant_page.reset_mock()
+        await coordinator.async_refresh()
+        mock_get_plant_page.assert_not_called()
+
+
+async def test_unused_overview_not_fetched(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the overview is left out while its sensors are disabled."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ) as mock_get_overview,
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage([PlantData(plant_id="1", power=40)]),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+
+        overview_keys = {
+            f"{mock_config_entry.entry_id}_{description.key}"
+            for description in (*OVERVIEW_SENSORS, *ROLLING_SENSORS)
+        }
+        _disable_entities(
+            entity_registry,
+            mock_config_entry,
+            overview_keys | _plant_power_ids("1"),
+        )
+        await hass.async_block_till_done()
+        mock_get_overview.reset_mock()
+        mock_get_plant_page.reset_mock()
+
+        # Nothing due that is used: no call at all.
+        await coordinator.async_refresh()
+        mock_get_overview.assert_not_called()
+        mock_get_plant_page.assert_not_called()
+        assert coordinator.unused_parts == {DataPart.OVERVIEW}
+
+        # The plant list still comes when due.
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        mock_get_plant_page.return_value = PlantPage(
+            [PlantData(plant_id="1", power=50)]
+        )
+        await coordinator.async_refresh()
+        mock_get_overview.assert_not_called()
+        mock_get_plant_page.assert_called_once()
+        assert coordinator.data.plants.get("1").power == 50
+        assert coordinator.data.overview_fetched_at is None
+
+        # The overview is fetched again once something uses it.
+        mock_get_overview.return_value = OverviewData(power=200)
+        coordinator.async_add_consumer(DataPart.OVERVIEW)
+        await hass.async_block_till_done()
+        mock_get_overview.assert_called_once()
+        assert coordinator.data.overview.power == 200
+
+
+async def test_overview_failure_keeps_last_overview(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test a failing overview keeps its last values while the plants update."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ) as mock_get_overview,
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage([PlantData(plant_id="1", power=40)]),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        fetched_at = dt_util.utcnow()
+
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        mock_get_overview.side_effect = RequestError
+        mock_get_plant_page.return_value = PlantPage(
+            [PlantData(plant_id="1", power=50)]
+        )
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert coordinator.last_update_success
+        assert coordinator.data.overview.power == 100
+        assert coordinator.data.overview_fetched_at == fetched_at
+        assert coordinator.data.plants.get("1").power == 50
+        assert coordinator.breaker.consecutive_failures == 0
+        state = hass.states.get("sensor.overview_power")
+        assert state.state == "100"
+        assert state.attributes["stale"] is True
+        assert state.attributes["fetched_at"] == fetched_at.isoformat()
+
+        # With nothing coming through, the failure counts for the breaker.
+        mock_get_plant_page.side_effect = RequestError
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.breaker.consecutive_failures == 1
+
+        mock_get_overview.side_effect = None
+        mock_get_plant_page.side_effect = None
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.overview_power")
+    assert "stale" not in state.attributes
+
+
+@pytest.mark.parametrize(
+    "emulator_config",
+    [HyponCloudEmulatorConfig(plant_count=PLANT_PAGE_SIZE * 2 + 50)],
+)
+async def test_plant_list_paginated(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    hypon_cloud_emulator: HyponCloudEmulator,
+) -> None:
+    """Test the plant list is fetched page by page and merged in place."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    assert len(coordinator.data.plants) == PLANT_PAGE_SIZE * 2 + 50
+    assert hypon_cloud_emulator.requests["plant/list2"] == 3
+    # The size covers all pages, which make up most of what was received.
+    response_size = coordinator.metrics.get("get_list").response_size
+    assert response_size > hypon_cloud_emulator.response_bytes / 2
+
+    plants = coordinator.data.plants
+    freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+    await coordinator.async_refresh()
+    assert coordinator.data.plants is plants
+    assert hypon_cloud_emulator.requests["plant/list2"] == 6
+    # The token from the setup is still valid, so no login is attempted.
+    assert hypon_cloud_emulator.requests["login"] == 1
+    assert "connect" not in coordinator.fetch_durations
+
+
+async def test_plant_list_resumes_at_failed_page(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test a page failing halfway through is taken up by the next update."""
+    mock_config_entry.add_to_hass(hass)
+    pages = {
+        1: PlantPage([PlantData(plant_id="1", power=40)], 2, "a"),
+        2: PlantPage([PlantData(plant_id="2", power=60)], 2, "b"),
+    }
+
+    async def _get_plant_page(*args) -> PlantPage:
+        if isinstance(page := pages[args[2]], Exception):
+            raise page
+        return page
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ) as mock_get_overview,
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            side_effect=_get_plant_page,
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        fetched_at = dt_util.utcnow()
+
+        # Pages merged on the way count as an answer of the cloud.
+        mock_get_overview.side_effect = RequestError
+        pages[1] = PlantPage([PlantData(plant_id="1", power=50)], 2, "c")
+        pages[2] = RequestError()
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        await coordinator.async_refresh()
+
+        # The merged page is kept, the plants show the age of the last list.
+        assert coordinator.data.plants.get("1").power == 50
+        assert coordinator.data.plants.get("2").power == 60
+        assert coordinator.data.plants_fetched_at == fetched_at
+        assert coordinator.breaker.consecutive_failures == 0
+
+        pages[2] = PlantPage([PlantData(plant_id="2", power=70)], 2, "d")
+        mock_get_plant_page.reset_mock()
+        await coordinator.async_refresh()
+
+    assert [call.args[2] for call in mock_get_plant_page.mock_calls] == [2]
+    assert coordinator.data.plants.get("2").power == 70
+    assert coordinator.data.plants_fetched_at is None
+    assert coordinator.plant_ids == {"1", "2"}
+
+
+@pytest.mark.parametrize(
+    "emulator_config", [HyponCloudEmulatorConfig(token_validity=600)]
+)
+async def test_rejected_token_replaced(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    hypon_cloud_emulator: HyponCloudEmulator,
+) -> None:
+    """Test a token the cloud expires early is replaced within the update."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    freezer.tick(timedelta(seconds=900))
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.breaker.consecutive_failures == 0
+    assert hypon_cloud_emulator.requests["login"] == 2
+    assert hypon_cloud_emulator.errors["plant/overview"] == 1
+
+
+@pytest.mark.parametrize(
+    "emulator_config",
+    [HyponCloudEmulatorConfig(plant_count=PLANT_ENTITY_CHUNK * 2 + 50)],
+)
+async def test_plant_sensors_added_in_chunks(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+    hypon_cloud_emulator: HyponCloudEmulator,
+) -> None:
+    """Test the sensors of many plants are all added, sharing their device."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    devices = dr.async_entries_for_config_entry(
+        device_registry, mock_config_entry.entry_id
+    )
+    assert len(devices) == PLANT_ENTITY_CHUNK * 2 + 51
+    plant_device = next(
+        device
+        for device in devices
+        if (DOMAIN, mock_config_entry.entry_id) not in device.identifiers
+    )
+    entities = er.async_entries_for_device(
+        entity_registry, plant_device.id, include_disabled_entities=True
+    )
+    assert len(entities) == len(PLANT_SENSORS)
+    assert all(hass.states.get(entity.entity_id) for entity in entities)
+
+
+async def test_plants_filtered(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test plants deselected in the options are dropped when fetched."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_EXCLUDE_NAMES: ["test*"]}
+    )
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [
+                    PlantData(plant_id="1", plant_name="Roof"),
+                    PlantData(plant_id="2", plant_name="Barn"),
+                    PlantData(plant_id="3", plant_name="Test bench"),
+                ]
+            ),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        assert set(coordinator.data.plants) == {"1", "2"}
+
+        # Changing the selection applies without a reload.
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_EXCLUDE_PLANTS: ["2"]}
+        )
+        await hass.async_block_till_done()
+
+        # Other options leave the plant list alone.
+        mock_get_plant_page.reset_mock()
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={CONF_EXCLUDE_PLANTS: ["2"], CONF_MIN_INTERVAL: 120},
+        )
+        await hass.async_block_till_done()
+        mock_get_plant_page.assert_not_called()
+
+    assert set(coordinator.data.plants) == {"1", "3"}
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "2")}) is None
+    assert hass.states.get("sensor.test_bench_power")
+
+
+async def test_plants_added_and_removed(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    device_registry: dr.DeviceRegistry,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test plants joining and leaving the account without a reload."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch("homeassistant.components.hypontech.session.HyponCloud.connect"),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=100),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [PlantData(plant_id="1", plant_name="Roof", power=40)]
+            ),
+        ) as mock_get_plant_page,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+
+        mock_get_plant_page.return_value = PlantPage(
+            [
+                PlantData(plant_id="1", plant_name="Roof", power=40),
+                PlantData(plant_id="2", plant_name="Barn", power=60),
+            ]
+        )
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.barn_power").state == "60"
+
+        mock_get_plant_page.return_value = PlantPage(
+            [PlantData(plant_id="2", plant_name="Barn", power=60)]
+        )
+        for _ in range(PLANT_REMOVAL_GRACE - 1):
+            freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        # A plant missing for a short while is only unavailable.
+        assert hass.states.get("sensor.roof_power").state == STATE_UNAVAILABLE
+        assert device_registry.async_get_device(identifiers={(DOMAIN, "1")})
+
+        freezer.tick(timedelta(seconds=PLANT_LIST_INTERVAL))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "1")}) is None
+    assert hass.states.get("sensor.roof_power") is None
+    assert coordinator.plant_ids == {"2"}
+
+
+async def test_circuit_breaker(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test the breaker opens after repeated failures and probes for recovery."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    assert hass.states.get("sensor.overview_circuit_breaker").state == "closed"
+
+    mock_hyponcloud.side_effect = RequestError
+    with patch(
+        "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+        side_effect=RequestError,
+    ):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+    assert coordinator.breaker.state is BreakerState.OPEN
+    assert hass.states.get("sensor.overview_circuit_breaker").state == "open"
+    assert coordinator.update_interval >= timedelta(seconds=BREAKER_BASE_DELAY)
+
+    # No request while the breaker is open.
+    mock_hyponcloud.reset_mock()
+    await coordinator.async_refresh()
+    mock_hyponcloud.assert_not_called()
+
+    # The probe after the delay closes the breaker again.
+    freezer.tick(timedelta(seconds=BREAKER_MAX_DELAY))
+    mock_hyponcloud.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert hass.states.get("sensor.overview_circuit_breaker").state == "closed"
+
+
+async def test_rate_limit_opens_breaker(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test a rate-limited update is not retried and opens the breaker."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    mock_hyponcloud.reset_mock()
+    mock_hyponcloud.side_effect = RateLimitError
+    await coordinator.async_refresh()
+
+    assert len(mock_hyponcloud.mock_calls) == 1
+    assert coordinator.breaker.state is BreakerState.OPEN
@@ -0,0 +1,55 @@
+"""Test the Hypontech Cloud diagnostics."""
+
+from unittest.mock import AsyncMock, patch
+
+from hyponcloud import PlantData
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.components.hypontech.api import PlantPage
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_entry_diagnostics(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test config entry diagnostics."""
+    mock_config_entry.add_to_hass(hass)
+    with patch(
+        "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+        return_value=PlantPage(
+            [PlantData(plant_id="1", plant_name="Home", city="Hanoi")]
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    result = await get_diagnostics_for_config_entry(
+        hass, hass_client, mock_config_entry
+    )
+
+    assert result["entry"]["data"] == {"username": REDACTED, "password": REDACTED}
+    assert result["entry"]["title"] == REDACTED
+    assert result["circuit_breaker"]["state"] == "closed"
+    assert result["schedule"]["slot"] == 0
+    assert result["schedule"]["accounts"] == 1
+    assert result["schedule"]["requests_in_flight"] == 0
+    assert result["schedule"]["unused_parts"] == []
+    assert result["cloud_cadence"] == {
+        "period": None,
+        "locked": False,
+        "probing": False,
+    }
+    assert result["metrics"]["get_overview"]["successes"] == 1
+    assert result["metrics"]["get_list"]["errors"] == 0
+    plant = result["data"]["plants"][0]
+    assert plant["plant_id"] == "1"
+    assert plant["plant_name"] == REDACTED
+    # Only the figures of a plant are kept, not its location.
+    assert "city" not in plant
@@ -0,0 +1,44 @@
+"""Test the Hypontech Cloud fleet aggregates."""
+
+from hyponcloud import PlantData
+
+from homeassistant.components.hypontech.fleet import FleetStats, compute_fleet_stats
+from homeassistant.components.hypontech.plants import PlantColumns
+
+
+def test_fleet_stats() -> None:
+    """Test top producers, specific yield and underperformers."""
+    plants = PlantColumns()
+    for plant_id, peak_power, power, e_today in (
+        ("1", 4000, 3000, 12.0),
+        ("2", 8000, 6400, 24.0),
+        ("3", 2000, 1400, 8.0),
+        ("4", 5000, 1000, 10.0),
+    ):
+        plants.update(
+            PlantData(plant_id=plant_id, power=power, e_today=e_today),
+            peak_power=peak_power,
+        )
+
+    stats = compute_fleet_stats(plants)
+
+    assert stats.top_producers == ("2", "1", "3", "4")
+    assert stats.specific_yield_min == 2.0
+    assert stats.specific_yield_median == 3.0
+    assert stats.specific_yield_max == 4.0
+    # Plant 4 produces 20% of its peak while its peers produce 70 to 80%.
+    assert stats.underperformers == ("4",)
+
+
+def test_fleet_stats_at_night() -> None:
+    """Test nothing is flagged while the fleet does not produce."""
+    plants = PlantColumns()
+    plants.update(PlantData(plant_id="1", e_today=10.0), peak_power=5000)
+    plants.update(PlantData(plant_id="2", e_today=12.0), peak_power=5000)
+
+    stats = compute_fleet_stats(plants)
+
+    assert stats.top_producers == ()
+    assert stats.underperformers == ()
+    assert stats.specific_yield_median == 2.2
+    assert compute_fleet_stats(PlantColumns()) == FleetStats()
@@ -0,0 +1,61 @@
+"""Test the Hypontech Cloud sample history."""
+
+from homeassistant.components.hypontech.history import SampleRing
+
+
+def test_rolling_figures() -> None:
+    """Test the rolling figures follow the samples."""
+    ring = SampleRing()
+    ring.add(0, 1000, 1.0)
+
+    assert ring.mean_power == [None, None, None]
+    assert ring.power_derivative is None
+    assert ring.interval_energy is None
+
+    ring.add(60, 1000, 1.0)
+    ring.add(120, 2000, 1.05)
+
+    # The mean covers the two minutes sampled so far.
+    assert ring.mean_power == [1000.0, 1000.0, 1000.0]
+    assert ring.power_derivative == 1000.0
+    assert ring.interval_energy == 0.05
+
+    ring.add(600, 2000, 1.3)
+
+    # 1000 W for two minutes, then 2000 W for the remaining eight.
+    assert ring.mean_power == [2000.0, 1800.0, 1800.0]
+    assert ring.power_derivative == 0.0
+    assert ring.interval_energy == 0.25
+
+    # Today energy starts again at midnight.
+    ring.add(660, 0, 0.0)
+    assert ring.interval_energy == 0.0
+
+
+def test_ring_is_bounded() -> None:
+    """Test old samples are overwritten and leave the windows."""
+    ring = SampleRing(size=4)
+    for minute in range(10):
+        ring.add(minute * 60, minute * 100, 0.0)
+
+    assert len(ring) == 4
+    # Samples from minute 6 on are held: 600, 700 and 800 W for a minute each.
+    assert ring.mean_power == [700.0, 700.0, 700.0]
+
+
+def test_flat_readings_move_windows() -> None:
+    """Test readings that change nothing still end the windows."""
+    ring = SampleRing()
+    for minute in range(60):
+        ring.add(minute * 60, 1000, minute / 60)
+
+    assert ring.add(3600, 0, 1.0)
+    for minute in range(61, 130):
+        ring.add(minute * 60, 0, 1.0)
+
+    # The samples stored are the first one and the drop to 0 W.
+    assert len(ring) == 61
+    assert ring.mean_power == [0.0, 0.0, 0.0]
+    assert ring.power_derivative == 0.0
+    assert ring.interval_energy == 0.0
+    assert not ring.add(130 * 60, 0, 1.0)
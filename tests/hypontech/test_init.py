@@ -1,12 +1,19 @@
 """Test the Hypontech Cloud init."""
 
+import asyncio
+from time import time
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
-from hyponcloud import AuthenticationError, RequestError
+from hyponcloud import AuthenticationError, OverviewData, PlantData, RequestError
 
+from homeassistant.components.hypontech.api import PlantPage
+from homeassistant.components.hypontech.session import STORAGE_KEY, STORAGE_VERSION
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 
+from .emulator import HyponCloudEmulator
+
 from tests.common import MockConfigEntry
 
 
@@ -17,7 +24,7 @@ async def test_setup_entry_timeout(
     mock_config_entry.add_to_hass(hass)
 
     with patch(
-        "homeassistant.components.hypontech.HyponCloud.connect",
+        "homeassistant.components.hypontech.session.HyponCloud.connect",
         side_effect=TimeoutError,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -33,7 +40,7 @@ async def test_setup_entry_authentication_error(
     mock_config_entry.add_to_hass(hass)
 
     with patch(
-        "homeassistant.components.hypontech.HyponCloud.connect",
+        "homeassistant.components.hypontech.session.HyponCloud.connect",
         side_effect=AuthenticationError,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -50,7 +57,7 @@ async def test_setup_entry_connection_error(
 
     with (
         patch(
-            "homeassistant.components.hypontech.HyponCloud.connect",
+            "homeassistant.components.hypontech.session.HyponCloud.connect",
             return_value=True,
         ),
         patch(
@@ -81,3 +88,135 @@ async def test_setup_and_unload_entry(
     await hass.async_block_till_done()
 
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_setup_entry_reuses_saved_token(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test a saved token is used instead of logging in again."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "test@example.com": {"token": "saved-token", "expires_at": time() + 600}
+        },
+    }
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage([]),
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    client = mock_config_entry.runtime_data.api
+    assert client._HyponCloud__token == "saved-token"
+
+
+async def test_setup_entry_replaces_rejected_token(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    hypon_cloud_emulator: HyponCloudEmulator,
+) -> None:
+    """Test a saved token the cloud rejects is replaced in the first update."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "test@example.com": {"token": "saved-token", "expires_at": time() + 600}
+        },
+    }
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert hypon_cloud_emulator.requests["login"] == 1
+    client = mock_config_entry.runtime_data.api
+    assert client._HyponCloud__token not in ("", "saved-token")
+
+
+async def test_remove_entry_forgets_token(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test removing an entry drops its saved token."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "test@example.com": {"token": "saved-token", "expires_at": time() + 600}
+        },
+    }
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"] == {}
+
+
+async def test_setup_entry_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test entities are created from the snapshot while the cloud is slow."""
+    mock_config_entry.add_to_hass(hass)
+    snapshot_key = f"hypontech.{mock_config_entry.entry_id}.snapshot"
+    hass_storage[snapshot_key] = {
+        "version": 1,
+        "key": snapshot_key,
+        "data": {
+            "overview": OverviewData(power=500).to_dict(),
+            "plants": [PlantData(plant_id="1", plant_name="Roof", power=500).to_dict()],
+        },
+    }
+    cloud_ready = asyncio.Event()
+
+    async def _slow_connect() -> None:
+        await cloud_ready.wait()
+
+    with (
+        patch(
+            "homeassistant.components.hypontech.session.HyponCloud.connect",
+            side_effect=_slow_connect,
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.HyponCloud.get_overview",
+            return_value=OverviewData(power=800),
+        ),
+        patch(
+            "homeassistant.components.hypontech.coordinator.async_get_plant_page",
+            return_value=PlantPage(
+                [PlantData(plant_id="1", plant_name="Roof", power=800)]
+            ),
+        ),
+        patch("homeassistant.components.hypontech.STARTUP_TIME_BUDGET", 0),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        state = hass.states.get("sensor.roof_power")
+        assert state.state == "500"
+        assert state.attributes["stale"] is True
+
+        cloud_ready.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get("sensor.roof_power")
+    assert state.state == "800"
+    assert "stale" not in state.attributes
@@ -0,0 +1,93 @@
+"""Test the Hypontech Cloud plant columns."""
+
+from collections.abc import Callable
+import logging
+import tracemalloc
+from typing import Any
+
+from hyponcloud import PlantData
+import pytest
+
+from homeassistant.components.hypontech.plants import PlantColumns
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _plant(index: int, power: int = 0) -> PlantData:
+    """Return a plant as parsed from the plant list."""
+    return PlantData(
+        plant_id=str(1000000 + index),
+        plant_name=f"Plant {index}",
+        city="Hanoi",
+        country="Vietnam",
+        power=power,
+        e_today=index / 10,
+        e_total=index * 100.5,
+    )
+
+
+def _measure(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by what a function builds."""
+    tracemalloc.start()
+    try:
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def test_update_and_remove() -> None:
+    """Test plants keep their slot while they are on the account."""
+    plants = PlantColumns()
+    assert plants.update(_plant(1, power=100))
+    assert plants.update(_plant(2, power=200))
+    assert not plants.update(_plant(1, power=100))
+    assert plants.update(_plant(1, power=150))
+
+    slot = plants.slot("1000002")
+    assert plants.power[slot] == 200
+
+    plants.remove("1000001")
+    assert plants.slot("1000001", 0) is None
+    assert plants.slot("1000002", slot) == slot
+    assert list(plants) == ["1000002"]
+    assert plants.get("1000002") == PlantData(
+        plant_id="1000002", plant_name="Plant 2", power=200, e_today=0.2, e_total=201
+    )
+
+    # A new plant takes the freed slot, a hint to the old plant misses it.
+    assert plants.update(_plant(3, power=300), peak_power=400)
+    assert len(plants.ids) == 2
+    assert plants.slot("1000003") == 0
+    assert plants.slot("1000001", 0) is None
+    assert plants.power[0] == 300
+    assert plants.peak_power[0] == 400
+
+
+@pytest.mark.parametrize("count", [10, 1000, 10000])
+def test_memory_against_plant_data(count: int) -> None:
+    """Benchmark the memory of the columns against one PlantData per plant."""
+
+    def _build_dict() -> dict[str, PlantData]:
+        return {
+            plant.plant_id: plant for plant in (_plant(index) for index in range(count))
+        }
+
+    def _build_columns() -> PlantColumns:
+        plants = PlantColumns()
+        for index in range(count):
+            plants.update(_plant(index))
+        return plants
+
+    dict_size = _measure(_build_dict)
+    columns_size = _measure(_build_columns)
+    _LOGGER.info(
+        "%d plants: %d bytes as PlantData, %d bytes as columns",
+        count,
+        dict_size,
+        columns_size,
+    )
+
+    assert columns_size < dict_size
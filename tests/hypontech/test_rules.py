@@ -0,0 +1,79 @@
+"""Test the Hypontech Cloud threshold rules."""
+
+from hyponcloud import OverviewData, PlantData
+
+from homeassistant.components.hypontech.const import (
+    CONF_RULES,
+    EVENT_THRESHOLD_CLEARED,
+    EVENT_THRESHOLD_TRIGGERED,
+)
+from homeassistant.components.hypontech.coordinator import HypontechCoordinatorData
+from homeassistant.components.hypontech.plants import PlantColumns
+from homeassistant.components.hypontech.rules import HypontechRuleEngine
+from homeassistant.core import HomeAssistant
+
+from tests.common import async_capture_events
+
+LOW_POWER_RULE = {
+    "rule_id": "low_power",
+    "name": "Low power",
+    "target": "plants",
+    "metric": "power",
+    "condition": "below",
+    "threshold": 500,
+    "hysteresis": 100,
+    "daylight_only": True,
+}
+
+
+def _data(*powers: int) -> HypontechCoordinatorData:
+    """Return coordinator data with plants producing the given power."""
+    plants = PlantColumns()
+    for number, power in enumerate(powers, 1):
+        plants.update(
+            PlantData(plant_id=str(number), plant_name=f"Plant {number}", power=power)
+        )
+    return HypontechCoordinatorData(overview=OverviewData(), plants=plants)
+
+
+async def test_threshold_rule_hysteresis(hass: HomeAssistant) -> None:
+    """Test a rule fires once per crossing and clears past the hysteresis."""
+    triggered = async_capture_events(hass, EVENT_THRESHOLD_TRIGGERED)
+    cleared = async_capture_events(hass, EVENT_THRESHOLD_CLEARED)
+    engine = HypontechRuleEngine(hass, "entry_id")
+    options = {CONF_RULES: [LOW_POWER_RULE]}
+
+    # The first evaluation only sets the state, plant 2 is already low.
+    engine.async_evaluate(options, _data(1000, 300), daylight=True)
+    engine.async_evaluate(options, _data(450, 550), daylight=True)
+    engine.async_evaluate(options, _data(400, 620), daylight=True)
+    await hass.async_block_till_done()
+
+    assert [event.data["plant_id"] for event in triggered] == ["1"]
+    assert triggered[0].data == {
+        "config_entry_id": "entry_id",
+        "rule_id": "low_power",
+        "rule": "Low power",
+        "plant_id": "1",
+        "plant_name": "Plant 1",
+        "metric": "power",
+        "value": 450,
+        "threshold": 500,
+    }
+    # 550 W is within the hysteresis, 620 W clears the rule.
+    assert [event.data["value"] for event in cleared] == [620]
+
+
+async def test_daylight_only_rule(hass: HomeAssistant) -> None:
+    """Test a daylight only rule is silent at night and at sunrise."""
+    triggered = async_capture_events(hass, EVENT_THRESHOLD_TRIGGERED)
+    engine = HypontechRuleEngine(hass, "entry_id")
+    options = {CONF_RULES: [LOW_POWER_RULE]}
+
+    engine.async_evaluate(options, _data(1000), daylight=True)
+    engine.async_evaluate(options, _data(0), daylight=False)
+    engine.async_evaluate(options, _data(100), daylight=True)
+    engine.async_evaluate(options, _data(200), daylight=True)
+    await hass.async_block_till_done()
+
+    assert triggered == []
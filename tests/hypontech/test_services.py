@@ -0,0 +1,115 @@
+"""Test the Hypontech Cloud services."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from hyponcloud import OverviewData, RequestError
+import pytest
+
+from homeassistant.components.hypontech.const import DOMAIN, SERVICE_REFRESH
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from tests.common import MockConfigEntry
+
+
+async def test_refresh_coalesced(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test concurrent and back-to-back refreshes share one update."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert mock_hyponcloud.call_count == 1
+
+    freezer.tick(timedelta(seconds=60))
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _get_overview(retries: int = 3) -> OverviewData:
+        started.set()
+        await release.wait()
+        return OverviewData(power=100)
+
+    mock_hyponcloud.side_effect = _get_overview
+    calls = [
+        hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH, blocking=True, return_response=True
+            )
+        )
+        for _ in range(3)
+    ]
+    await started.wait()
+    release.set()
+    responses = await asyncio.gather(*calls)
+
+    assert mock_hyponcloud.call_count == 2
+    expected = {
+        "entries": {
+            mock_config_entry.entry_id: {
+                "last_fetched": dt_util.utcnow().isoformat(),
+                "success": True,
+            }
+        }
+    }
+    assert responses == [expected] * 3
+
+    # Within the minimum spacing the last data is returned.
+    freezer.tick(timedelta(seconds=5))
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_REFRESH,
+        {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == expected
+    assert mock_hyponcloud.call_count == 2
+
+
+async def test_refresh_spaced_during_outage(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test refreshes are spaced from the last attempt, also a failed one."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    mock_hyponcloud.side_effect = RequestError
+    freezer.tick(timedelta(seconds=60))
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, blocking=True)
+    call_count = mock_hyponcloud.call_count
+
+    freezer.tick(timedelta(seconds=5))
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, blocking=True)
+    assert mock_hyponcloud.call_count == call_count
+
+
+async def test_refresh_unknown_entry(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_hyponcloud: AsyncMock,
+) -> None:
+    """Test refreshing an entry of another integration fails."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REFRESH,
+            {ATTR_CONFIG_ENTRY_ID: "unknown"},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,64 @@
+"""Soak test of the Hypontech Cloud integration against the emulated cloud."""
+
+from datetime import timedelta
+import logging
+import os
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .emulator import HyponCloudEmulator, HyponCloudEmulatorConfig
+from .soak import async_run_soak
+
+from tests.common import MockConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Simulated hours per run, the soak only runs when they are set.
+SOAK_HOURS = float(os.environ.get("HYPONTECH_SOAK_HOURS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    not SOAK_HOURS, reason="Set HYPONTECH_SOAK_HOURS to run the soak test"
+)
+
+
+@pytest.mark.parametrize(
+    "emulator_config",
+    [
+        HyponCloudEmulatorConfig(
+            plant_count=2000,
+            latency_median=0.01,
+            error_rate=0.02,
+            error_burst=4,
+            token_validity=1800,
+        )
+    ],
+)
+async def test_soak(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    hypon_cloud_emulator: HyponCloudEmulator,
+) -> None:
+    """Test the integration stays healthy over hours of polling."""
+    freezer.move_to("2026-06-21 04:00:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+
+    report = await async_run_soak(
+        hass,
+        freezer,
+        mock_config_entry.runtime_data,
+        timedelta(hours=SOAK_HOURS),
+    )
+    _LOGGER.info("Soak report: %s", report.summary())
+
+    assert report.cycles > 0
+    assert report.failed_cycles < report.cycles
+    assert max(report.state_writes) <= len(hass.states.async_all())
+    assert report.memory_growth < 2 * 1024 * 1024
@@ -0,0 +1,80 @@
+"""Test the Hypontech Cloud request throttle."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from hyponcloud import HyponCloud
+import pytest
+
+from homeassistant.components.hypontech.const import (
+    LOGIN_SPACING,
+    MAX_CONCURRENT_REQUESTS,
+)
+from homeassistant.components.hypontech.throttle import async_get_throttle
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+async def test_stagger_spreads_accounts(hass: HomeAssistant) -> None:
+    """Test the updates of the accounts are spread over the interval."""
+    throttle = async_get_throttle(hass)
+    unregister = [throttle.async_register(entry_id) for entry_id in "abcd"]
+    now = dt_util.parse_datetime("2026-06-21 12:00:07+00:00")
+    interval = timedelta(seconds=60)
+
+    delays = [throttle.async_stagger(entry_id, now, interval) for entry_id in "abcd"]
+
+    assert all(interval / 2 <= delay < interval * 3 / 2 for delay in delays)
+    seconds = sorted(round((now + delay).timestamp()) % 60 for delay in delays)
+    assert seconds == [0, 15, 30, 45]
+
+    # A single account keeps its interval.
+    for callback in unregister[1:]:
+        callback()
+    assert throttle.async_slot("a") == (0, 1)
+    assert throttle.async_stagger("a", now, interval) == interval
+
+
+async def test_requests_capped(hass: HomeAssistant) -> None:
+    """Test the calls running at once are capped over all accounts."""
+    throttle = async_get_throttle(hass)
+    release = asyncio.Event()
+
+    async def _request() -> None:
+        async with throttle.async_request():
+            await release.wait()
+
+    tasks = [
+        hass.async_create_task(_request()) for _ in range(MAX_CONCURRENT_REQUESTS + 2)
+    ]
+    await asyncio.sleep(0)
+
+    assert throttle.in_flight == MAX_CONCURRENT_REQUESTS
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert throttle.in_flight == 0
+
+
+@pytest.mark.parametrize(
+    ("state", "waits"), [(CoreState.starting, 1), (CoreState.running, 0)]
+)
+async def test_logins_spaced_at_startup(
+    hass: HomeAssistant, state: CoreState, waits: int
+) -> None:
+    """Test logins are spaced out while Home Assistant starts."""
+    hass.set_state(state)
+    throttle = async_get_throttle(hass)
+    client = HyponCloud("test@example.com", "test-password")
+
+    with patch(
+        "homeassistant.components.hypontech.throttle.asyncio.sleep",
+        new_callable=AsyncMock,
+    ) as mock_sleep:
+        await throttle.async_wait_login(client)
+        await throttle.async_wait_login(client)
+
+    assert mock_sleep.await_count == waits
+    if waits:
+        assert mock_sleep.await_args.args[0] == pytest.approx(LOGIN_SPACING, abs=0.1)